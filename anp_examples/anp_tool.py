@@ -4,11 +4,16 @@ import yaml
 import aiohttp
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 
 from agent_connect.authentication import DIDWbaAuthHeader
 
+from anp_examples.response_cache import ResponseCache
+from anp_examples.utils.log_base import get_logger
+
+log = get_logger(__name__)
+
 
 class ANPTool:
     name: str = "anp_tool"
@@ -55,6 +60,13 @@ class ANPTool:
         self,
         did_document_path: Optional[str] = None,
         private_key_path: Optional[str] = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30.0,
+        ttl_dns_cache: int = 300,
+        request_timeout: float = 60.0,
+        response_cache: Optional[ResponseCache] = None,
+        coalesce_requests: bool = True,
         **data,
     ):
         """
@@ -63,9 +75,59 @@ class ANPTool:
         Args:
             did_document_path (str, optional): Path to DID document file. If None, will use default path.
             private_key_path (str, optional): Path to private key file. If None, will use default path.
+            limit (int, optional): Maximum number of pooled connections in total
+            limit_per_host (int, optional): Maximum number of pooled connections per agent host
+            keepalive_timeout (float, optional): Seconds an idle connection is kept alive for reuse
+            ttl_dns_cache (int, optional): Seconds resolved host names are cached
+            request_timeout (float, optional): Total timeout of a single request in seconds
+            response_cache (ResponseCache, optional): Cache for GET responses. If None, nothing is cached.
+            coalesce_requests (bool, optional): Share one upstream request between concurrent identical GETs
         """
         super().__init__(**data)
 
+        # Connector settings, the session itself is created lazily per event loop
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.request_timeout = request_timeout
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self.response_cache = response_cache
+        self.coalesce_requests = coalesce_requests
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalescing_stats: Dict[str, int] = {"upstream": 0, "coalesced_waiters": 0}
+
+        # Count how often a cached bearer token is reused versus a DID-WBA signature header sent
+        self.auth_stats: Dict[str, int] = {"token_reuse": 0, "did_signature": 0}
+
+        did_document_path, private_key_path = self.resolve_did_paths(
+            did_document_path, private_key_path
+        )
+
+        logging.info(
+            f"ANPTool initialized - DID path: {did_document_path}, private key path: {private_key_path}"
+        )
+
+        self.auth_client = DIDWbaAuthHeader(
+            did_document_path=did_document_path, private_key_path=private_key_path
+        )
+
+    @staticmethod
+    def resolve_did_paths(
+        did_document_path: Optional[str] = None,
+        private_key_path: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """
+        Resolve the DID document and private key paths, falling back to the
+        environment variables and then to the bundled test identity
+
+        Args:
+            did_document_path (str, optional): Path to DID document file
+            private_key_path (str, optional): Path to private key file
+
+        Returns:
+            Tuple[str, str]: Resolved DID document path and private key path
+        """
         # Get current script directory
         current_dir = Path(__file__).parent
         # Get project root directory
@@ -88,13 +150,59 @@ class ANPTool:
                     base_dir / "use_did_test_public/key-1_private.pem"
                 )
 
-        logging.info(
-            f"ANPTool initialized - DID path: {did_document_path}, private key path: {private_key_path}"
-        )
+        return did_document_path, private_key_path
 
-        self.auth_client = DIDWbaAuthHeader(
-            did_document_path=did_document_path, private_key_path=private_key_path
+    async def __aenter__(self) -> "ANPTool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a pooled HTTP session bound to the running event loop"""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
         )
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the long-lived HTTP session of the running event loop
+
+        aiohttp sessions cannot be shared across event loops, so one session is
+        kept per loop and reused by every request issued from that loop.
+
+        Returns:
+            aiohttp.ClientSession: Pooled session for the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Forget sessions whose event loop is gone
+            for stale_loop in [l for l in self._sessions if l.is_closed()]:
+                self._sessions.pop(stale_loop)
+            session = self._create_session()
+            self._sessions[loop] = session
+            logging.info(
+                f"ANPTool created HTTP session (limit={self.limit}, limit_per_host={self.limit_per_host})"
+            )
+        return session
+
+    async def aclose(self) -> None:
+        """Close the HTTP session of the running event loop and drop sessions of closed loops"""
+        loop = asyncio.get_running_loop()
+        for session_loop, session in list(self._sessions.items()):
+            if session_loop is loop:
+                await session.close()
+            elif not session_loop.is_closed():
+                # Sessions of other live loops must be closed from their own loop
+                continue
+            self._sessions.pop(session_loop)
 
     async def execute(
         self,
@@ -107,6 +215,61 @@ class ANPTool:
         """
         Execute HTTP request to interact with other agents
 
+        Concurrent identical GET requests are coalesced: the first one goes
+        upstream and the others wait for it and receive the same result
+        object, which callers must therefore treat as read-only.
+
+        Args:
+            url (str): URL of the agent description file or API endpoint
+            method (str, optional): HTTP method, default is "GET"
+            headers (Dict[str, str], optional): HTTP request headers
+            params (Dict[str, Any], optional): URL query parameters
+            body (Dict[str, Any], optional): Request body for POST/PUT requests
+
+        Returns:
+            Dict[str, Any]: Response content
+        """
+        if not self.coalesce_requests or method != "GET" or body is not None:
+            return await self._execute(url, method, headers, params, body)
+
+        key = json.dumps(
+            [url, sorted((params or {}).items()), sorted((headers or {}).items())],
+            ensure_ascii=False,
+            default=str,
+        )
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalescing_stats["coalesced_waiters"] += 1
+            log.debug("ANP request coalesced with in-flight request", url=url)
+        else:
+            self.coalescing_stats["upstream"] += 1
+            # Run the upstream request as its own task so a cancelled caller does not cancel the waiters
+            task = asyncio.ensure_future(
+                self._execute(url, method, headers, params, body)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished in-flight request"""
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key)
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _execute(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Dict[str, str] = None,
+        params: Dict[str, Any] = None,
+        body: Dict[str, Any] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute HTTP request to interact with other agents
+
         Args:
             url (str): URL of the agent description file or API endpoint
             method (str, optional): HTTP method, default is "GET"
@@ -127,7 +290,24 @@ class ANPTool:
         if not url.startswith(("http://", "https://")):
             url = f"http://{url}"
 
-        logging.info(f"ANP request: {method} {url}")
+        log.debug("ANP request", method=method, url=url)
+
+        # Serve cacheable GETs from the response cache when the entry is still fresh
+        cache_key = None
+        cached_entry = None
+        if self.response_cache is not None and method == "GET" and body is None:
+            cache_key = self.response_cache.make_key(
+                url, params, self.auth_client.did_document_path if self.auth_client else ""
+            )
+            cached_entry = await self.response_cache.get(cache_key)
+            if cached_entry is not None and self.response_cache.is_fresh(cached_entry):
+                log.debug("ANP response served from cache", url=url)
+                return self.response_cache.hit(cached_entry)
+            if cached_entry is not None and self.response_cache.can_revalidate(cached_entry):
+                headers.update(self.response_cache.conditional_headers(cached_entry))
+            else:
+                cached_entry = None
+                self.response_cache.miss()
 
         # Add basic request headers
         if "Content-Type" not in headers and method in ["POST", "PUT", "PATCH"]:
@@ -138,55 +318,90 @@ class ANPTool:
             try:
                 auth_headers = self.auth_client.get_auth_header(url)
                 headers.update(auth_headers)
+                self._record_auth_header(auth_headers)
             except Exception as e:
                 logging.error(f"Failed to get authentication header: {str(e)}")
 
-        async with aiohttp.ClientSession() as session:
-            # Prepare request parameters
-            request_kwargs = {
-                "url": url,
-                "headers": headers,
-                "params": params,
-            }
-
-            # If there is a request body and the method supports it, add the request body
-            if body is not None and method in ["POST", "PUT", "PATCH"]:
-                request_kwargs["json"] = body
-
-            # Execute request
-            http_method = getattr(session, method.lower())
-
-            try:
-                async with http_method(**request_kwargs) as response:
-                    logging.info(f"ANP response: status code {response.status}")
-
-                    # Check response status
-                    if (
-                        response.status == 401
-                        and "Authorization" in headers
-                        and self.auth_client
-                    ):
-                        logging.warning(
-                            "Authentication failed (401), trying to get authentication again"
+        session = await self.get_session()
+
+        # Prepare request parameters
+        request_kwargs = {
+            "url": url,
+            "headers": headers,
+            "params": params,
+        }
+
+        # If there is a request body and the method supports it, add the request body
+        if body is not None and method in ["POST", "PUT", "PATCH"]:
+            request_kwargs["json"] = body
+
+        # Execute request
+        http_method = getattr(session, method.lower())
+
+        try:
+            async with http_method(**request_kwargs) as response:
+                log.info("ANP response", method=method, url=url, status=response.status)
+
+                # Check response status
+                if (
+                    response.status == 401
+                    and "Authorization" in headers
+                    and self.auth_client
+                ):
+                    logging.warning(
+                        "Authentication failed (401), trying to get authentication again"
+                    )
+                    # If authentication fails and a token was used, clear the token and retry
+                    self.auth_client.clear_token(url)
+                    # Get authentication header again
+                    auth_headers = self.auth_client.get_auth_header(url, force_new=True)
+                    headers.update(auth_headers)
+                    self._record_auth_header(auth_headers)
+                    # Execute request again
+                    request_kwargs["headers"] = headers
+                    async with http_method(**request_kwargs) as retry_response:
+                        log.info(
+                            "ANP retry response",
+                            method=method,
+                            url=url,
+                            status=retry_response.status,
                         )
-                        # If authentication fails and a token was used, clear the token and retry
-                        self.auth_client.clear_token(url)
-                        # Get authentication header again
-                        headers.update(
-                            self.auth_client.get_auth_header(url, force_new=True)
+                        return await self._handle_response(
+                            retry_response, url, cache_key, cached_entry
                         )
-                        # Execute request again
-                        request_kwargs["headers"] = headers
-                        async with http_method(**request_kwargs) as retry_response:
-                            logging.info(
-                                f"ANP retry response: status code {retry_response.status}"
-                            )
-                            return await self._process_response(retry_response, url)
-
-                    return await self._process_response(response, url)
-            except aiohttp.ClientError as e:
-                logging.error(f"HTTP request failed: {str(e)}")
-                return {"error": f"HTTP request failed: {str(e)}", "status_code": 500}
+
+                return await self._handle_response(response, url, cache_key, cached_entry)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"HTTP request failed: {str(e)}")
+            return {"error": f"HTTP request failed: {str(e)}", "status_code": 500}
+
+    def _record_auth_header(self, auth_headers: Dict[str, str]) -> None:
+        """Update auth_stats with the kind of authentication header that was sent"""
+        authorization = auth_headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            self.auth_stats["token_reuse"] += 1
+        elif authorization:
+            self.auth_stats["did_signature"] += 1
+
+    async def _handle_response(self, response, url, cache_key, cached_entry):
+        """Process HTTP response and keep the response cache up to date"""
+        if cache_key is None:
+            return await self._process_response(response, url)
+
+        if response.status == 304 and cached_entry is not None:
+            log.debug("ANP response revalidated from cache", url=url)
+            return await self.response_cache.revalidated(
+                cache_key, cached_entry, response.headers
+            )
+
+        if cached_entry is not None:
+            # Conditional GET returned a new representation
+            self.response_cache.miss()
+
+        result = await self._process_response(response, url)
+        if response.status == 200:
+            await self.response_cache.store(cache_key, result, response.headers)
+        return result
 
     async def _process_response(self, response, url):
         """Process HTTP response"""
@@ -208,7 +423,7 @@ class ANPTool:
             # Process JSON response
             try:
                 result = json.loads(text)
-                logging.info("Successfully parsed JSON response")
+                log.debug("Parsed JSON response", url=url)
             except json.JSONDecodeError:
                 logging.warning(
                     "Content-Type declared as JSON but parsing failed, returning raw text"
@@ -218,7 +433,7 @@ class ANPTool:
             # Process YAML response
             try:
                 result = yaml.safe_load(text)
-                logging.info("Successfully parsed YAML response")
+                log.debug("Parsed YAML response", url=url)
                 result = {
                     "data": result,
                     "format": "yaml",
@@ -0,0 +1,252 @@
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+# A stage takes a crawled document and returns a (possibly) smaller version of it
+DocumentStage = Callable[[Any], Any]
+
+HTTP_METHODS = {"get", "post", "put", "delete", "patch", "head", "options"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap prompt token estimate, about four characters per token"""
+    return len(text) // 4 + 1
+
+
+def strip_context(document: Any) -> Any:
+    """Remove JSON-LD @context blocks, which the model does not need to follow links"""
+    if isinstance(document, dict):
+        return {
+            key: strip_context(value)
+            for key, value in document.items()
+            if key != "@context"
+        }
+    if isinstance(document, list):
+        return [strip_context(item) for item in document]
+    return document
+
+
+def _openapi_skeleton(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an OpenAPI/Swagger spec to its servers, paths, methods and parameters"""
+    info = spec.get("info") or {}
+    paths = {}
+    for path, operations in (spec.get("paths") or {}).items():
+        if not isinstance(operations, dict):
+            continue
+        path_skeleton = {}
+        for method, operation in operations.items():
+            if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            operation_skeleton = {
+                key: operation[key]
+                for key in ("operationId", "summary")
+                if key in operation
+            }
+            parameters = [
+                {
+                    key: parameter[key]
+                    for key in ("name", "in", "required")
+                    if key in parameter
+                }
+                for parameter in operation.get("parameters") or []
+                if isinstance(parameter, dict)
+            ]
+            if parameters:
+                operation_skeleton["parameters"] = parameters
+            request_body = operation.get("requestBody")
+            if isinstance(request_body, dict):
+                operation_skeleton["requestBody"] = list(
+                    (request_body.get("content") or {}).keys()
+                )
+            path_skeleton[method] = operation_skeleton
+        paths[path] = path_skeleton
+
+    skeleton = {
+        "openapi": spec.get("openapi", spec.get("swagger")),
+        "info": {key: info[key] for key in ("title", "version") if key in info},
+        "paths": paths,
+        "note": "Large spec truncated to its path/parameter skeleton",
+    }
+    if "servers" in spec:
+        skeleton["servers"] = spec["servers"]
+    return skeleton
+
+
+def _is_openapi(data: Any) -> bool:
+    return isinstance(data, dict) and "paths" in data and (
+        "openapi" in data or "swagger" in data
+    )
+
+
+def make_openapi_truncator(max_chars: int = 8000) -> DocumentStage:
+    """
+    Create a stage that truncates large OpenAPI documents to their skeleton
+
+    Handles specs returned as parsed JSON, as ANPTool YAML wrappers
+    ({"data": ..., "format": "yaml"}) and as raw YAML text wrappers.
+    """
+
+    def truncate_openapi(document: Any) -> Any:
+        if not isinstance(document, dict):
+            return document
+
+        if _is_openapi(document):
+            if len(json.dumps(document, ensure_ascii=False)) > max_chars:
+                return _openapi_skeleton(document)
+            return document
+
+        data = document.get("data")
+        if _is_openapi(data):
+            if len(json.dumps(data, ensure_ascii=False)) > max_chars:
+                return {**document, "data": _openapi_skeleton(data)}
+            return document
+
+        text = document.get("text")
+        if isinstance(text, str) and len(text) > max_chars:
+            if text.lstrip().startswith(("openapi", "swagger")):
+                try:
+                    data = yaml.safe_load(text)
+                except yaml.YAMLError:
+                    return document
+                if _is_openapi(data):
+                    compacted = {k: v for k, v in document.items() if k != "text"}
+                    compacted["data"] = _openapi_skeleton(data)
+                    return compacted
+        return document
+
+    return truncate_openapi
+
+
+DEFAULT_STAGES: List[DocumentStage] = [strip_context, make_openapi_truncator()]
+
+
+class ContextManager:
+    """
+    Keeps the simple_crawl message history within a prompt token budget.
+
+    Documents pass through a pipeline of stages before they are pasted into
+    the conversation. Before each model request, tool results the model has
+    already answered are dropped oldest first, and the largest remaining tool
+    results are truncated, until the estimated prompt fits the token budget.
+    """
+
+    def __init__(
+        self,
+        stages: Optional[List[DocumentStage]] = None,
+        token_budget: int = 24000,
+        min_tool_message_chars: int = 2000,
+    ):
+        """
+        Initialize the context manager
+
+        Args:
+            stages: Document stages applied in order, defaults to DEFAULT_STAGES
+            token_budget: Estimated prompt token budget of one model request
+            min_tool_message_chars: Tool results are never truncated below this length
+        """
+        self.stages = list(DEFAULT_STAGES if stages is None else stages)
+        self.token_budget = token_budget
+        self.min_tool_message_chars = min_tool_message_chars
+
+        # tool_call_id -> URL and raw serialized size of the tool result
+        self._tool_call_urls: Dict[str, str] = {}
+        self._raw_sizes: Dict[str, int] = {}
+        # Per-iteration prompt token savings
+        self.savings: List[Dict[str, int]] = []
+
+    def compact_document(self, document: Any) -> str:
+        """Run a document through the stages and serialize it compactly"""
+        for stage in self.stages:
+            document = stage(document)
+        return json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+
+    def tool_message(self, tool_call_id: str, url: str, result: Any) -> Dict[str, Any]:
+        """Build the tool message of a crawled document"""
+        self._tool_call_urls[tool_call_id] = url
+        self._raw_sizes[tool_call_id] = len(json.dumps(result, ensure_ascii=False))
+        return {
+            "role": "tool",
+            "tool_call_id": tool_call_id,
+            "content": self.compact_document(result),
+        }
+
+    def prepare(self, messages: List[Dict[str, Any]], iteration: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get the messages to send for one model request within the token budget
+
+        The given message history is not modified.
+
+        Args:
+            messages: Full message history
+            iteration: Crawl iteration, used when reporting savings
+
+        Returns:
+            List[Dict[str, Any]]: Messages for the model request
+        """
+        prepared = [dict(message) for message in messages]
+
+        def total_tokens() -> int:
+            return sum(
+                estimate_tokens(message.get("content") or "") for message in prepared
+            )
+
+        tokens = total_tokens()
+
+        if tokens > self.token_budget:
+            # A tool result is already summarized once an assistant turn follows it
+            last_assistant = max(
+                (i for i, m in enumerate(prepared) if m.get("role") == "assistant"),
+                default=-1,
+            )
+            for index, message in enumerate(prepared[:last_assistant]):
+                if tokens <= self.token_budget:
+                    break
+                if message.get("role") != "tool":
+                    continue
+                before = estimate_tokens(message.get("content") or "")
+                message["content"] = json.dumps(
+                    {
+                        "url": self._tool_call_urls.get(message.get("tool_call_id"), ""),
+                        "omitted": "Document was already processed in an earlier turn, request it again if needed",
+                    },
+                    ensure_ascii=False,
+                )
+                tokens -= before - estimate_tokens(message["content"])
+
+        if tokens > self.token_budget:
+            # Truncate the largest tool results until the prompt fits
+            tool_messages = sorted(
+                (m for m in prepared if m.get("role") == "tool"),
+                key=lambda m: len(m.get("content") or ""),
+                reverse=True,
+            )
+            for message in tool_messages:
+                if tokens <= self.token_budget:
+                    break
+                content = message.get("content") or ""
+                excess_chars = (tokens - self.token_budget) * 4
+                keep = max(self.min_tool_message_chars, len(content) - excess_chars)
+                if keep >= len(content):
+                    continue
+                message["content"] = content[:keep] + "...[truncated]"
+                tokens = total_tokens()
+
+        raw_tokens = sum(
+            self._raw_sizes.get(message.get("tool_call_id"), len(message.get("content") or "")) // 4 + 1
+            if message.get("role") == "tool"
+            else estimate_tokens(message.get("content") or "")
+            for message in messages
+        )
+        report = {
+            "iteration": iteration,
+            "raw_tokens": raw_tokens,
+            "prompt_tokens": tokens,
+            "saved_tokens": raw_tokens - tokens,
+        }
+        self.savings.append(report)
+        logging.info(
+            f"Context compaction iteration {iteration}: ~{tokens} prompt tokens, saved ~{report['saved_tokens']} of ~{raw_tokens}"
+        )
+        return prepared
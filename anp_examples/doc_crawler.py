@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from anp_examples.anp_tool import ANPTool
+from anp_examples.link_extractor import normalize_url
+
+
+class DocTreeCrawler:
+    """
+    Concurrent breadth-first crawler for agent description documents.
+
+    The crawl is level-synchronous: every document of one depth is fetched
+    concurrently by a bounded pool of workers reading from an asyncio queue,
+    and the links they contain form the next level. Latency of a crawl is
+    therefore roughly depth x slowest fetch instead of the sum of all fetches.
+    """
+
+    def __init__(
+        self,
+        anp_tool: ANPTool,
+        extract_links: Callable[[Any], Iterable[str]],
+        max_level: int = 5,
+        max_docs: int = 30,
+        max_workers: int = 8,
+        per_host_limit: int = 4,
+    ):
+        """
+        Initialize the crawler
+
+        Args:
+            anp_tool (ANPTool): Tool used to fetch documents
+            extract_links (Callable): Function returning the links found in a fetched document
+            max_level (int, optional): Number of levels to crawl, the initial URL is level 0
+            max_docs (int, optional): Maximum number of documents to crawl
+            max_workers (int, optional): Number of documents fetched concurrently
+            per_host_limit (int, optional): Number of documents fetched concurrently from one host
+        """
+        self.anp_tool = anp_tool
+        self.extract_links = extract_links
+        self.max_level = max_level
+        self.max_docs = max_docs
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+
+        self.visited_urls: Set[str] = set()
+        self.crawled_documents: List[Dict[str, Any]] = []
+        # (parent URL, child URL) for every link found in a crawled document
+        self.edges: List[Tuple[str, str]] = []
+        # URL -> URL of the document it was first discovered from
+        self.discovered_from: Dict[str, Optional[str]] = {}
+        # Normalized URL -> the URL it was first seen as, to dedupe different spellings
+        self._urls_by_key: Dict[str, str] = {}
+
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._reserved = 0
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent fetches from the URL's host"""
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def crawl(self, initial_url: str) -> List[Dict[str, Any]]:
+        """
+        Crawl the document tree starting at the initial URL
+
+        Args:
+            initial_url (str): URL of the root document
+
+        Returns:
+            List[Dict[str, Any]]: Crawled documents in breadth-first order, the root first
+        """
+        for url in self.visited_urls:
+            self._urls_by_key.setdefault(self._url_key(url), url)
+        self._urls_by_key.setdefault(self._url_key(initial_url), initial_url)
+        level_urls = [initial_url]
+        self.discovered_from.setdefault(initial_url, None)
+
+        level = 0
+        while level_urls and level < self.max_level:
+            if len(self.crawled_documents) >= self.max_docs:
+                break
+
+            results = await self._crawl_level(level_urls, level)
+
+            # Collect documents in discovery order so the output is deterministic
+            next_level_urls = []
+            for url, result in zip(level_urls, results):
+                if result is None:
+                    continue
+                self.crawled_documents.append(
+                    {"url": url, "method": "GET", "content": result}
+                )
+                for link in self.extract_links(result):
+                    key = self._url_key(link)
+                    known_url = self._urls_by_key.get(key)
+                    # Edges point at the URL a document is crawled as, whatever its spelling here
+                    target = link if known_url is None else known_url
+                    if target == url:
+                        continue
+                    self.edges.append((url, target))
+                    if known_url is not None or link in self.visited_urls:
+                        continue
+                    self._urls_by_key[key] = link
+                    self.discovered_from[link] = url
+                    next_level_urls.append(link)
+
+            level_urls = next_level_urls
+            level += 1
+
+        return self.crawled_documents
+
+    @staticmethod
+    def _url_key(url: str) -> str:
+        return normalize_url(url) or url
+
+    async def _crawl_level(
+        self, level_urls: List[str], level: int
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Fetch all URLs of one level with a bounded worker pool"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, url in enumerate(level_urls):
+            queue.put_nowait((index, url))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(level_urls)
+
+        async def worker():
+            while True:
+                try:
+                    index, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[index] = await self._fetch(url, level)
+                finally:
+                    queue.task_done()
+
+        worker_count = max(1, min(self.max_workers, len(level_urls)))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+        return results
+
+    async def _fetch(self, url: str, level: int) -> Optional[Dict[str, Any]]:
+        """Fetch one document if the document budget allows it"""
+        if url in self.visited_urls or self._reserved >= self.max_docs:
+            return None
+
+        # Reserve the budget slot before awaiting so concurrent workers cannot overshoot it
+        self._reserved += 1
+        self.visited_urls.add(url)
+        try:
+            async with self._host_semaphore(url):
+                result = await self.anp_tool.execute(url=url)
+            logging.info(f"Successfully obtained document: {url}, current depth: {level}")
+            return result
+        except Exception as e:
+            self._reserved -= 1
+            self.visited_urls.discard(url)
+            logging.error(f"Failed to get document: {url}, error: {str(e)}")
+            return None
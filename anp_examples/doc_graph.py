@@ -0,0 +1,83 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+ROOT_NODE_NAME = "Root Node"
+
+# Link types
+TREE_LINK = "tree"
+CROSS_LINK = "cross"
+BACK_LINK = "back"
+
+
+def build_doc_graph(
+    documents: List[Dict[str, Any]],
+    edges: Iterable[Tuple[str, str]],
+    embed_documents: bool = True,
+) -> Dict[str, Any]:
+    """
+    Build the document tree and the link graph of a crawl in O(n + e)
+
+    Documents are expected in crawl order (the root first) and edges as the
+    (parent URL, child URL) pairs recorded by DocTreeCrawler, in the order
+    they were discovered. A document's tree parent is the first crawled
+    document that linked to it from earlier in the crawl, which is the
+    document it was discovered from. Documents without such a parent hang
+    off the root node.
+
+    Every edge between two crawled documents is also returned as a link:
+    "tree" for spanning tree edges, "cross" for other links pointing
+    forward in crawl order, and "back" for links to a document crawled
+    earlier. Tree and cross links together form a DAG; back links are the
+    ones that close cycles.
+
+    Args:
+        documents (List[Dict[str, Any]]): Crawled documents with "url" and "content"
+        edges (Iterable[Tuple[str, str]]): (parent URL, child URL) edges in discovery order
+        embed_documents (bool, optional): Include each document as the "doc" of its node
+
+    Returns:
+        Dict[str, Any]: {"doc_tree": tree in the shape of DocumentTree,
+        "links": [{"source": ..., "target": ..., "type": ...}, ...]}
+    """
+    doc_tree = {"name": ROOT_NODE_NAME, "children": []}
+    nodes: Dict[str, Dict[str, Any]] = {}
+    order: Dict[str, int] = {}
+    for doc in documents:
+        url = doc["url"]
+        if url in nodes:
+            continue
+        order[url] = len(order)
+        nodes[url] = {
+            "name": url.split("/")[-1],
+            "url": url,
+            "children": [],
+            "doc": doc if embed_documents else None,
+        }
+
+    parents: Dict[str, str] = {}
+    links: List[Dict[str, str]] = []
+    seen = set()
+    for source, target in edges:
+        if source == target or (source, target) in seen:
+            continue
+        if source not in order or target not in order:
+            continue
+        seen.add((source, target))
+
+        if order[source] >= order[target]:
+            link_type = BACK_LINK
+        elif target not in parents:
+            parents[target] = source
+            link_type = TREE_LINK
+        else:
+            link_type = CROSS_LINK
+        links.append({"source": source, "target": target, "type": link_type})
+
+    # Attach children in crawl order so the tree does not depend on edge order
+    for url, node in nodes.items():
+        parent = parents.get(url)
+        if parent is None:
+            doc_tree["children"].append(node)
+        else:
+            nodes[parent]["children"].append(node)
+
+    return {"doc_tree": doc_tree, "links": links}
@@ -0,0 +1,221 @@
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import SplitResult, urljoin, urlsplit, urlunsplit
+
+import yaml
+
+# Keys whose string values are links in agent description documents
+DEFAULT_LINK_KEYS = frozenset({"@id", "url", "serviceEndpoint"})
+# Keys whose values are never walked
+DEFAULT_SKIP_KEYS = frozenset({"@context"})
+
+URL_PREFIXES = ("http://", "https://")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+OPENAPI_KEYS = ("openapi", "swagger")
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """
+    Normalize an absolute http(s) URL for deduplication
+
+    Lowercases the scheme and host, drops default ports, fragments and
+    trailing slashes (an empty path becomes "/"), and keeps the query.
+
+    Args:
+        url (str): URL to normalize
+
+    Returns:
+        Optional[str]: Normalized URL, or None if it is not an http(s) URL
+    """
+    url = url.strip()
+    # Cheap prefix check before parsing, most strings in a document are not URLs
+    if not url.startswith(URL_PREFIXES) and not url[:8].lower().startswith(URL_PREFIXES):
+        return None
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc
+    if "@" in netloc or ":" in netloc or netloc != netloc.lower():
+        netloc = _normalize_netloc(parts, scheme)
+    if not netloc:
+        return None
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def _normalize_netloc(parts: SplitResult, scheme: str) -> Optional[str]:
+    """Lowercase the host and drop the default port of a netloc with a port or userinfo"""
+    try:
+        port = parts.port
+    except ValueError:
+        return None
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if ":" in host:
+        host = f"[{host}]"
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username or parts.password:
+        userinfo = parts.username or ""
+        if parts.password:
+            userinfo = f"{userinfo}:{parts.password}"
+        host = f"{userinfo}@{host}"
+    return host
+
+
+class LinkExtractor:
+    """
+    Extracts the links of a fetched document for the doc-tree crawler.
+
+    Walks the document with an explicit stack, so deeply nested documents
+    cannot hit the recursion limit, and collects the string values of the
+    configured keys. Documents in the wrappers produced by ANPTool are
+    understood: {"data": ..., "format": "yaml"} is walked like any other
+    dict, and {"text": ...} is parsed as YAML (which includes JSON) when it
+    looks like an OpenAPI document. For OpenAPI documents every GET path
+    without path parameters is expanded against each servers[].url (or
+    host/basePath for Swagger 2.0), so a crawl reaches the interface
+    endpoints directly. Links are returned as written in the document
+    (stripped of surrounding whitespace), once each, in the order they were
+    first found; URLs that normalize to the same form count as one link.
+    """
+
+    def __init__(
+        self,
+        link_keys: Iterable[str] = DEFAULT_LINK_KEYS,
+        skip_keys: Iterable[str] = DEFAULT_SKIP_KEYS,
+        expand_openapi: bool = True,
+    ):
+        """
+        Initialize the extractor
+
+        Args:
+            link_keys (Iterable[str], optional): Keys whose string values are links
+            skip_keys (Iterable[str], optional): Keys whose values are not walked
+            expand_openapi (bool, optional): Expand OpenAPI servers and paths into links
+        """
+        self.link_keys = frozenset(link_keys)
+        self.skip_keys = frozenset(skip_keys)
+        self.expand_openapi = expand_openapi
+
+    def __call__(self, document: Any) -> List[str]:
+        """
+        Extract the links of a document
+
+        Args:
+            document (Any): Parsed document, usually the result of ANPTool.execute
+
+        Returns:
+            List[str]: Deduplicated links in document order
+        """
+        base_url = None
+        if isinstance(document, dict):
+            base_url = document.get("url") if isinstance(document.get("url"), str) else None
+            if document.get("format") == "text" and isinstance(document.get("text"), str):
+                document = self._parse_text(document["text"])
+
+        # Normalized URL -> link as first found
+        links: Dict[str, str] = {}
+        link_keys = self.link_keys
+        skip_keys = self.skip_keys
+        stack = [document]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, dict):
+                if self.expand_openapi and self._is_openapi(obj):
+                    for key, link in self._openapi_links(obj, base_url):
+                        links.setdefault(key, link)
+                    # Server URLs are bases, not documents
+                    obj = {key: value for key, value in obj.items() if key != "servers"}
+                children = []
+                for key, value in obj.items():
+                    if key in skip_keys:
+                        continue
+                    if isinstance(value, str):
+                        if key in link_keys:
+                            link_key = normalize_url(value)
+                            if link_key is not None:
+                                links.setdefault(link_key, value.strip())
+                    elif isinstance(value, (dict, list)):
+                        children.append(value)
+                # Reversed so the stack visits children in document order
+                stack.extend(reversed(children))
+            elif isinstance(obj, list):
+                stack.extend(
+                    item for item in reversed(obj) if isinstance(item, (dict, list))
+                )
+        # ANPTool adds the document's own URL to the result
+        if base_url is not None:
+            links.pop(normalize_url(base_url), None)
+        return list(links.values())
+
+    @staticmethod
+    def _parse_text(text: str) -> Any:
+        """Parse a text response that looks like an OpenAPI document"""
+        head = text.lstrip()[:200]
+        if not any(key in head for key in OPENAPI_KEYS):
+            return None
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            logging.warning(f"Failed to parse text response as OpenAPI: {e}")
+            return None
+
+    @staticmethod
+    def _is_openapi(obj: Dict[str, Any]) -> bool:
+        return isinstance(obj.get("paths"), dict) and any(key in obj for key in OPENAPI_KEYS)
+
+    @staticmethod
+    def _server_urls(spec: Dict[str, Any], base_url: Optional[str]) -> List[str]:
+        """Base URLs of an OpenAPI 3 or Swagger 2.0 document"""
+        urls = []
+        servers = spec.get("servers")
+        if isinstance(servers, list):
+            for server in servers:
+                if not isinstance(server, dict) or not isinstance(server.get("url"), str):
+                    continue
+                url = server["url"]
+                variables = server.get("variables")
+                if isinstance(variables, dict):
+                    for name, variable in variables.items():
+                        if isinstance(variable, dict) and "default" in variable:
+                            url = url.replace(f"{{{name}}}", str(variable["default"]))
+                urls.append(url)
+        elif isinstance(spec.get("host"), str):
+            base_path = spec.get("basePath") if isinstance(spec.get("basePath"), str) else ""
+            schemes = spec.get("schemes") or ["https"]
+            urls.extend(f"{scheme}://{spec['host']}{base_path}" for scheme in schemes)
+
+        resolved = []
+        for url in urls:
+            # Relative server URLs are relative to the document itself
+            if not url.startswith(URL_PREFIXES) and base_url is not None:
+                url = urljoin(base_url, url)
+            if "{" not in url:
+                resolved.append(url.rstrip("/"))
+        return resolved
+
+    def _openapi_links(
+        self, spec: Dict[str, Any], base_url: Optional[str]
+    ) -> List[Tuple[str, str]]:
+        """(normalized URL, URL) of the GET endpoints that can be fetched without parameters"""
+        links = []
+        servers = self._server_urls(spec, base_url)
+        for path, operations in spec["paths"].items():
+            if not isinstance(path, str) or "{" in path:
+                continue
+            if not isinstance(operations, dict) or "get" not in operations:
+                continue
+            for server in servers:
+                link = server + path
+                link_key = normalize_url(link)
+                if link_key is not None:
+                    links.append((link_key, link))
+        return links
+
+
+extract_links = LinkExtractor()
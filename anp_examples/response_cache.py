@@ -0,0 +1,249 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional
+
+
+def parse_cache_control(header: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a directive -> value dictionary"""
+    directives: Dict[str, Optional[str]] = {}
+    if not header:
+        return directives
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, value = part.partition("=")
+        directives[name.strip().lower()] = value.strip().strip('"') or None
+    return directives
+
+
+class ResponseCache:
+    """
+    Opt-in cache of ANPTool GET responses.
+
+    Entries live in an in-memory LRU with TTL and, if a path is given, in an
+    sqlite file that survives restarts and keeps at most max_disk_entries of
+    the most recently stored entries. Stale entries that carry an ETag or
+    Last-Modified validator are revalidated with a conditional GET instead of
+    being refetched. Cache-Control no-store, no-cache and max-age are honored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 300.0,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 10000,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int, optional): Maximum number of entries kept in memory
+            default_ttl (float, optional): Freshness lifetime in seconds when the response sets no max-age
+            disk_path (str, optional): Path of the sqlite file of the on-disk tier. If None, only memory is used.
+            max_disk_entries (int, optional): Maximum number of entries kept in the sqlite file
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+        self._disk_writes = 0
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "disk_skipped": 0,
+        }
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, entry TEXT NOT NULL)"
+            )
+            columns = [row[1] for row in self._db.execute("PRAGMA table_info(responses)")]
+            if "stored_at" not in columns:
+                # Files written before the size limit have no store time
+                self._db.execute(
+                    "ALTER TABLE responses ADD COLUMN stored_at REAL NOT NULL DEFAULT 0"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+            self._disk_trim()
+            self._db.commit()
+            logging.info(f"Response cache disk tier: {disk_path}")
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Mapping[str, Any]], identity: str) -> str:
+        """Build the cache key of a GET request from its URL, query parameters and DID identity"""
+        raw = json.dumps(
+            [url, sorted((params or {}).items()), identity],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT entry FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _disk_set(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            raw = json.dumps(entry, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            # e.g. dates parsed from YAML; the entry stays in memory only
+            self.stats["disk_skipped"] += 1
+            logging.warning(f"Response cache entry not persisted, not JSON serializable: {e}")
+            return
+
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, entry, stored_at) VALUES (?, ?, ?)",
+                (key, raw, time.time()),
+            )
+            self._disk_writes += 1
+            # Trimming scans the index, so do it once per batch of writes
+            if self._disk_writes % 100 == 0:
+                self._disk_trim()
+            self._db.commit()
+
+    def _disk_trim(self) -> None:
+        """Delete the oldest rows above max_disk_entries, the caller commits"""
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached entry, fresh or stale
+
+        Returns:
+            Optional[Dict[str, Any]]: Entry with result, etag, last_modified and expires_at keys, or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(None, self._disk_get, key)
+            if entry is not None:
+                self._remember(key, entry)
+        return entry
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return entry["expires_at"] > time.time()
+
+    @staticmethod
+    def can_revalidate(entry: Dict[str, Any]) -> bool:
+        return bool(entry.get("etag") or entry.get("last_modified"))
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Get the If-None-Match / If-Modified-Since headers revalidating an entry"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _expires_at(self, cache_control: Dict[str, Optional[str]]) -> float:
+        if "no-cache" in cache_control:
+            # Stored, but has to be revalidated before every use
+            return 0.0
+        ttl = self.default_ttl
+        max_age = cache_control.get("max-age")
+        if max_age is not None:
+            try:
+                ttl = float(max_age)
+            except ValueError:
+                pass
+        return time.time() + ttl
+
+    async def store(self, key: str, result: Dict[str, Any], headers: Mapping[str, str]) -> None:
+        """
+        Store a 200 response if its Cache-Control allows it
+
+        Args:
+            key: Cache key from make_key
+            result: Processed response content
+            headers: Response headers
+        """
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in cache_control:
+            return
+
+        entry = {
+            "result": copy.deepcopy(result),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "expires_at": self._expires_at(cache_control),
+        }
+        self._remember(key, entry)
+        self.stats["stores"] += 1
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_set, key, entry)
+
+    async def revalidated(self, key: str, entry: Dict[str, Any], headers: Mapping[str, str]) -> Dict[str, Any]:
+        """
+        Refresh an entry after a 304 Not Modified response
+
+        Returns:
+            Dict[str, Any]: Copy of the cached result
+        """
+        self.stats["revalidated"] += 1
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+        entry["expires_at"] = self._expires_at(cache_control)
+        if headers.get("ETag"):
+            entry["etag"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            entry["last_modified"] = headers["Last-Modified"]
+        self._remember(key, entry)
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_set, key, entry)
+        return copy.deepcopy(entry["result"])
+
+    def hit(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Count a fresh hit and get a copy of the cached result"""
+        self.stats["hits"] += 1
+        return copy.deepcopy(entry["result"])
+
+    def miss(self) -> None:
+        self.stats["misses"] += 1
+
+    def close(self) -> None:
+        """Close the on-disk tier"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
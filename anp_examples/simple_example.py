@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Union, Callable, AsyncIterator
 import os
 import json
 import logging
@@ -6,9 +6,12 @@ import asyncio
 from pathlib import Path
 from openai import AsyncAzureOpenAI
 from dotenv import load_dotenv
-from anp_examples.utils.log_base import set_log_color_level
+from anp_examples.utils.log_base import get_logger, set_log_color_level
 from anp_examples.anp_tool import ANPTool  # Import ANPTool
+from anp_examples.context_manager import ContextManager
 from openai import AsyncOpenAI,OpenAI
+from openai.types.chat import ChatCompletionMessageToolCall
+from openai.types.chat.chat_completion_message_tool_call import Function
 from config import validate_config,DASHSCOPE_API_KEY,DASHSCOPE_BASE_URL,DASHSCOPE_MODEL_NAME
 
 # Get the absolute path to the root directory
@@ -21,6 +24,8 @@ from datetime import datetime
 
 current_date = datetime.now().strftime("%Y-%m-%d")
 
+log = get_logger(__name__)
+
 validate_config()
 
 SEARCH_AGENT_PROMPT_TEMPLATE = f"""
@@ -89,16 +94,40 @@ def get_available_tools(anp_tool_instance):
     ]
 
 
+def tool_error_message(tool_call: Any, error: str, message: Optional[str] = None) -> Dict:
+    """Build the tool message answering a tool call that could not be executed"""
+    content = {"error": error}
+    if message is not None:
+        content["message"] = message
+    return {
+        "role": "tool",
+        "tool_call_id": tool_call.id,
+        "content": json.dumps(content, ensure_ascii=False),
+    }
+
+
 async def handle_tool_call(
     tool_call: Any,
     messages: List[Dict],
     anp_tool: ANPTool,
     crawled_documents: List[Dict],
     visited_urls: set,
+    context_manager: Optional[ContextManager] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> None:
-    """Handle tool call"""
+    """Handle tool call, reporting tool_call_start/tool_call_end events to on_event"""
     function_name = tool_call.function.name
-    function_args = json.loads(tool_call.function.arguments)
+    try:
+        function_args = json.loads(tool_call.function.arguments)
+        if not isinstance(function_args, dict):
+            raise ValueError("arguments must be a JSON object")
+    except ValueError as e:
+        # json.JSONDecodeError is a ValueError; the model can retry with valid arguments
+        logging.error(f"Invalid arguments for tool call {tool_call.id}: {str(e)}")
+        messages.append(
+            tool_error_message(tool_call, f"Invalid arguments for {function_name}", str(e))
+        )
+        return
 
     if function_name == "anp_tool":
         url = function_args.get("url")
@@ -107,27 +136,65 @@ async def handle_tool_call(
         params = function_args.get("params", {})
         body = function_args.get("body")
 
+        if on_event is not None:
+            on_event(
+                {
+                    "type": "tool_call_start",
+                    "tool_call_id": tool_call.id,
+                    "url": url,
+                    "method": method,
+                }
+            )
+
         try:
             # Use ANPTool to get URL content
             result = await anp_tool.execute(
                 url=url, method=method, headers=headers, params=params, body=body
             )
-            logging.info(f"ANPTool response [url: {url}]")
+            log.debug("ANPTool response", url=url)
 
             # Record visited URLs and obtained content
             visited_urls.add(url)
-            crawled_documents.append({"url": url, "method": method, "content": result})
-
-            messages.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": json.dumps(result, ensure_ascii=False),
-                }
-            )
+            document = {"url": url, "method": method, "content": result}
+            crawled_documents.append(document)
+
+            if on_event is not None:
+                on_event(
+                    {
+                        "type": "tool_call_end",
+                        "tool_call_id": tool_call.id,
+                        "url": url,
+                        "method": method,
+                        "status": result.get("status_code"),
+                        "document": document,
+                    }
+                )
+
+            if context_manager is not None:
+                messages.append(context_manager.tool_message(tool_call.id, url, result))
+            else:
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "content": json.dumps(result, ensure_ascii=False),
+                    }
+                )
         except Exception as e:
             logging.error(f"Error using ANPTool for URL {url}: {str(e)}")
 
+            if on_event is not None:
+                on_event(
+                    {
+                        "type": "tool_call_end",
+                        "tool_call_id": tool_call.id,
+                        "url": url,
+                        "method": method,
+                        "status": "error",
+                        "document": None,
+                    }
+                )
+
             messages.append(
                 {
                     "role": "tool",
@@ -140,6 +207,110 @@ async def handle_tool_call(
                     ),
                 }
             )
+    else:
+        logging.error(f"Unknown tool: {function_name}")
+        messages.append(tool_error_message(tool_call, f"Unknown tool: {function_name}"))
+
+
+def is_crawl_call(tool_call: Any) -> bool:
+    """Whether a tool call is an anp_tool call with valid arguments, i.e. may crawl a document"""
+    if tool_call.function.name != "anp_tool":
+        return False
+    try:
+        return isinstance(json.loads(tool_call.function.arguments), dict)
+    except ValueError:
+        return False
+
+
+async def handle_tool_calls(
+    tool_calls: List[Any],
+    messages: List[Dict],
+    anp_tool: ANPTool,
+    crawled_documents: List[Dict],
+    visited_urls: set,
+    max_documents: int,
+    max_concurrent_tool_calls: int = 5,
+    context_manager: Optional[ContextManager] = None,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> None:
+    """
+    Handle the tool calls of one assistant turn concurrently
+
+    Each call that may crawl a document reserves a budget slot, in tool
+    call order, before it fetches, so concurrent calls can never crawl more
+    than max_documents documents. A call that ends without adding a
+    document (e.g. a failed fetch) gives its slot back to the calls still
+    waiting, and calls with invalid arguments or unknown tools never take
+    one. Calls left without a slot are answered without crawling. Tool
+    messages and crawled documents are appended in the original tool call
+    order.
+    """
+    budget = {"remaining": max(0, max_documents - len(crawled_documents)), "in_flight": 0}
+    budget_changed = asyncio.Condition()
+
+    call_messages = [[] for _ in tool_calls]
+    call_documents = [[] for _ in tool_calls]
+    semaphore = asyncio.Semaphore(max_concurrent_tool_calls)
+
+    async def reserve() -> bool:
+        """Take a budget slot, waiting while calls holding the last slots may still give one back"""
+        async with budget_changed:
+            await budget_changed.wait_for(
+                lambda: budget["remaining"] > 0 or budget["in_flight"] == 0
+            )
+            if budget["remaining"] <= 0:
+                return False
+            budget["remaining"] -= 1
+            budget["in_flight"] += 1
+            return True
+
+    async def release(used: bool) -> None:
+        async with budget_changed:
+            budget["in_flight"] -= 1
+            if not used:
+                budget["remaining"] += 1
+            budget_changed.notify_all()
+
+    async def run(index: int, tool_call: Any) -> None:
+        crawl_call = is_crawl_call(tool_call)
+        if crawl_call and not await reserve():
+            call_messages[index].append(
+                tool_error_message(
+                    tool_call,
+                    f"Reached the maximum number of documents to crawl {max_documents}, URL was not crawled",
+                )
+            )
+            return
+        try:
+            async with semaphore:
+                await handle_tool_call(
+                    tool_call,
+                    call_messages[index],
+                    anp_tool,
+                    call_documents[index],
+                    visited_urls,
+                    context_manager,
+                    on_event,
+                )
+        finally:
+            if crawl_call:
+                await release(bool(call_documents[index]))
+
+    # One failing call must not drop the answers of the others
+    results = await asyncio.gather(
+        *(run(index, tool_call) for index, tool_call in enumerate(tool_calls)),
+        return_exceptions=True,
+    )
+
+    for index, tool_call in enumerate(tool_calls):
+        if isinstance(results[index], BaseException):
+            logging.error(f"Tool call {tool_call.id} failed: {str(results[index])}")
+            if not call_messages[index]:
+                call_messages[index].append(
+                    tool_error_message(tool_call, "Tool call failed", str(results[index]))
+                )
+        messages.extend(call_messages[index])
+        crawled_documents.extend(call_documents[index])
 
 
 async def simple_crawl(
@@ -149,6 +320,9 @@ async def simple_crawl(
     private_key_path: Optional[str] = None,
     max_documents: int = 10,
     initial_url: str = "https://agent-search.ai/ad.json",
+    anp_tool: Optional[ANPTool] = None,
+    max_concurrent_tool_calls: int = 5,
+    context_manager: Optional[ContextManager] = None,
 ) -> Dict[str, Any]:
     """
     Simplified crawling logic: let the model decide the crawling path autonomously
@@ -160,18 +334,188 @@ async def simple_crawl(
         private_key_path: Private key path
         max_documents: Maximum number of documents to crawl
         initial_url: Initial URL to start crawling from
+        anp_tool: Shared ANPTool whose pooled session is reused. If None, a
+            temporary ANPTool is created from the DID paths and closed afterwards.
+        max_concurrent_tool_calls: Maximum number of tool calls of one model turn executed concurrently
+        context_manager: Compacts crawled documents and the message history sent to the model.
+            If None, a ContextManager with the default stages and token budget is used.
 
     Returns:
         Dictionary containing the crawl results
     """
-    # Initialize variables
-    visited_urls = set()
-    crawled_documents = []
+    result = None
+    async for event in simple_crawl_events(
+        user_input,
+        task_type,
+        did_document_path=did_document_path,
+        private_key_path=private_key_path,
+        max_documents=max_documents,
+        initial_url=initial_url,
+        anp_tool=anp_tool,
+        max_concurrent_tool_calls=max_concurrent_tool_calls,
+        context_manager=context_manager,
+    ):
+        if event["type"] == "result":
+            result = event["result"]
+    return result
+
+
+async def simple_crawl_events(
+    user_input: str,
+    task_type: str = "general",
+    did_document_path: Optional[str] = None,
+    private_key_path: Optional[str] = None,
+    max_documents: int = 10,
+    initial_url: str = "https://agent-search.ai/ad.json",
+    anp_tool: Optional[ANPTool] = None,
+    max_concurrent_tool_calls: int = 5,
+    context_manager: Optional[ContextManager] = None,
+    stream: bool = False,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run simple_crawl and yield progress events as they happen
+
+    Event types:
+        llm_turn: a model request starts (iteration, max_iterations)
+        content_delta: model output text (iteration, content), token by token when streaming
+        llm_response: a model turn finished (iteration, content, tool_calls)
+        tool_call_start: a URL fetch starts (tool_call_id, url, method)
+        tool_call_end: a URL fetch finished (tool_call_id, url, method, status, document)
+        result: the crawl finished (result), always the last event
+
+    Args:
+        stream: Use the OpenAI streaming API so content_delta events carry single tokens.
+            Other arguments are the same as for simple_crawl.
+    """
+    context_manager = context_manager or ContextManager()
+
+    if anp_tool is not None:
+        async for event in _crawl_events(
+            user_input,
+            task_type,
+            anp_tool,
+            max_documents,
+            initial_url,
+            max_concurrent_tool_calls,
+            context_manager,
+            stream,
+        ):
+            yield event
+        return
 
     # Initialize ANPTool
-    anp_tool = ANPTool(
+    async with ANPTool(
         did_document_path=did_document_path, private_key_path=private_key_path
-    )
+    ) as owned_anp_tool:
+        async for event in _crawl_events(
+            user_input,
+            task_type,
+            owned_anp_tool,
+            max_documents,
+            initial_url,
+            max_concurrent_tool_calls,
+            context_manager,
+            stream,
+        ):
+            yield event
+
+
+async def _drain_events(
+    task: "asyncio.Future", events: "asyncio.Queue"
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield events put on the queue until the task has finished"""
+    getter: Optional["asyncio.Future"] = None
+    try:
+        while not task.done() or not events.empty():
+            if not events.empty():
+                yield events.get_nowait()
+                continue
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+        # Re-raise a failure of the task
+        await task
+    finally:
+        # The consumer may stop (disconnect, cancellation) while a getter is pending
+        if getter is not None and not getter.done():
+            getter.cancel()
+        if not task.done():
+            task.cancel()
+
+
+async def _complete(
+    client: AsyncOpenAI, request: Dict[str, Any], iteration: int, stream: bool
+) -> AsyncIterator[Any]:
+    """
+    Run one model request
+
+    Yields content_delta events and finally a (content, tool_calls) tuple.
+    With stream=True the tool calls are assembled from the streamed deltas.
+    """
+    if not stream:
+        completion = await client.chat.completions.create(**request)
+        if completion.usage is not None:
+            logging.info(f"Prompt tokens used: {completion.usage.prompt_tokens}")
+        response_message = completion.choices[0].message
+        if response_message.content:
+            yield {
+                "type": "content_delta",
+                "iteration": iteration,
+                "content": response_message.content,
+            }
+        yield response_message.content, response_message.tool_calls
+        return
+
+    content_parts = []
+    tool_call_parts: Dict[int, Dict[str, str]] = {}
+    response_stream = await client.chat.completions.create(stream=True, **request)
+    async for chunk in response_stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content_parts.append(delta.content)
+            yield {"type": "content_delta", "iteration": iteration, "content": delta.content}
+        for tool_call_delta in delta.tool_calls or []:
+            part = tool_call_parts.setdefault(
+                tool_call_delta.index, {"id": "", "name": "", "arguments": ""}
+            )
+            if tool_call_delta.id:
+                part["id"] = tool_call_delta.id
+            if tool_call_delta.function is not None:
+                if tool_call_delta.function.name:
+                    part["name"] += tool_call_delta.function.name
+                if tool_call_delta.function.arguments:
+                    part["arguments"] += tool_call_delta.function.arguments
+
+    tool_calls = [
+        ChatCompletionMessageToolCall(
+            id=part["id"],
+            type="function",
+            function=Function(name=part["name"], arguments=part["arguments"] or "{}"),
+        )
+        for _, part in sorted(tool_call_parts.items())
+    ]
+    yield "".join(content_parts) or None, tool_calls or None
+
+
+async def _crawl_events(
+    user_input: str,
+    task_type: str,
+    anp_tool: ANPTool,
+    max_documents: int,
+    initial_url: str,
+    max_concurrent_tool_calls: int,
+    context_manager: ContextManager,
+    stream: bool,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the crawl loop of simple_crawl with the given ANPTool"""
+    # Initialize variables
+    visited_urls = set()
+    crawled_documents = []
 
     # Initialize Azure OpenAI client
     # client = AsyncAzureOpenAI(
@@ -188,22 +532,42 @@ async def simple_crawl(
     )
 
     # Get initial URL content
+    yield {"type": "tool_call_start", "tool_call_id": None, "url": initial_url, "method": "GET"}
     try:
         initial_content = await anp_tool.execute(url=initial_url)
         visited_urls.add(initial_url)
-        crawled_documents.append(
-            {"url": initial_url, "method": "GET", "content": initial_content}
-        )
+        initial_document = {"url": initial_url, "method": "GET", "content": initial_content}
+        crawled_documents.append(initial_document)
 
         logging.info(f"Successfully obtained initial URL: {initial_url}")
+        yield {
+            "type": "tool_call_end",
+            "tool_call_id": None,
+            "url": initial_url,
+            "method": "GET",
+            "status": initial_content.get("status_code"),
+            "document": initial_document,
+        }
     except Exception as e:
         logging.error(f"Failed to obtain initial URL {initial_url}: {str(e)}")
-        return {
-            "content": f"Failed to obtain initial URL: {str(e)}",
-            "type": "error",
-            "visited_urls": [],
-            "crawled_documents": [],
+        yield {
+            "type": "tool_call_end",
+            "tool_call_id": None,
+            "url": initial_url,
+            "method": "GET",
+            "status": "error",
+            "document": None,
+        }
+        yield {
+            "type": "result",
+            "result": {
+                "content": f"Failed to obtain initial URL: {str(e)}",
+                "type": "error",
+                "visited_urls": [],
+                "crawled_documents": [],
+            },
         }
+        return
 
     # Create initial message
     formatted_prompt = SEARCH_AGENT_PROMPT_TEMPLATE.format(
@@ -215,16 +579,22 @@ async def simple_crawl(
         {"role": "user", "content": user_input},
         {
             "role": "system",
-            "content": f"I have obtained the content of the initial URL. Here is the description data of the search agent:\n\n```json\n{json.dumps(initial_content, ensure_ascii=False, indent=2)}\n```\n\nPlease analyze this data, understand the functions and API usage of the search agent. Find the links you need to visit, and use the anp_tool to get more information to complete the user's task.",
+            "content": f"I have obtained the content of the initial URL. Here is the description data of the search agent:\n\n```json\n{context_manager.compact_document(initial_content)}\n```\n\nPlease analyze this data, understand the functions and API usage of the search agent. Find the links you need to visit, and use the anp_tool to get more information to complete the user's task.",
         },
     ]
 
     # Start conversation loop
     current_iteration = 0
+    content = None
 
     while current_iteration < max_documents:
         current_iteration += 1
-        logging.info(f"Starting crawl iteration {current_iteration}/{max_documents}")
+        log.debug("Starting crawl iteration", iteration=current_iteration, max_iterations=max_documents)
+        yield {
+            "type": "llm_turn",
+            "iteration": current_iteration,
+            "max_iterations": max_documents,
+        }
 
         # Check if the maximum number of documents to crawl has been reached
         if len(crawled_documents) >= max_documents:
@@ -240,40 +610,64 @@ async def simple_crawl(
             )
 
         # Get model response
-        completion = await client.chat.completions.create(
-            model = DASHSCOPE_MODEL_NAME,
-            messages = messages,
-            tools = get_available_tools(anp_tool),
-            tool_choice = "auto",
-        )
+        request = {
+            "model": DASHSCOPE_MODEL_NAME,
+            "messages": context_manager.prepare(messages, current_iteration),
+            "tools": get_available_tools(anp_tool),
+            "tool_choice": "auto",
+        }
+        async for item in _complete(client, request, current_iteration, stream):
+            if isinstance(item, dict):
+                yield item
+            else:
+                content, tool_calls = item
 
-        response_message = completion.choices[0].message
         messages.append(
             {
                 "role": "assistant",
-                "content": response_message.content,
-                "tool_calls": response_message.tool_calls,
+                "content": content,
+                "tool_calls": tool_calls,
             }
         )
 
-        # debug code
-        logging.info(f"Model response: {response_message.content}")
-        logging.info(f"Tool calls: {response_message.tool_calls}")
+        log.debug(
+            "Model response",
+            content=content,
+            tool_calls=[tool_call.function.name for tool_call in tool_calls or []],
+        )
+
+        yield {
+            "type": "llm_response",
+            "iteration": current_iteration,
+            "content": content,
+            "tool_calls": [
+                {"id": tool_call.id, "arguments": tool_call.function.arguments}
+                for tool_call in tool_calls or []
+            ],
+        }
 
         # Check if the conversation should end
-        if not response_message.tool_calls:
+        if not tool_calls:
             logging.info("The model did not request any tool calls, ending crawl")
             break
 
-        # Handle tool calls
-        for tool_call in response_message.tool_calls:
-            await handle_tool_call(
-                tool_call, messages, anp_tool, crawled_documents, visited_urls
+        # Handle tool calls concurrently, stopping at the maximum number of documents to crawl
+        events: asyncio.Queue = asyncio.Queue()
+        tool_calls_task = asyncio.ensure_future(
+            handle_tool_calls(
+                tool_calls,
+                messages,
+                anp_tool,
+                crawled_documents,
+                visited_urls,
+                max_documents,
+                max_concurrent_tool_calls,
+                context_manager,
+                events.put_nowait,
             )
-
-            # If the maximum number of documents to crawl is reached, stop handling tool calls
-            if len(crawled_documents) >= max_documents:
-                break
+        )
+        async for event in _drain_events(tool_calls_task, events):
+            yield event
 
         # If the maximum number of documents to crawl is reached, make a final summary
         if (
@@ -287,14 +681,14 @@ async def simple_crawl(
 
     # Create result
     result = {
-        "content": response_message.content,
+        "content": content,
         "type": "text",
         "visited_urls": [doc["url"] for doc in crawled_documents],
         "crawled_documents": crawled_documents,
         "task_type": task_type,
     }
 
-    return result
+    yield {"type": "result", "result": result}
 
 
 async def main():
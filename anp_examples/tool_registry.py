@@ -0,0 +1,112 @@
+import os
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+from anp_examples.anp_tool import ANPTool
+
+
+class ANPToolRegistry:
+    """
+    Application-scoped registry of ANPTool instances, one per DID identity.
+
+    Each ANPTool owns a DIDWbaAuthHeader, which caches the loaded DID document
+    and the bearer tokens issued by every agent domain. Keeping one tool per
+    identity for the lifetime of the application lets later requests reuse
+    those tokens instead of restarting the DID-WBA signature handshake.
+    """
+
+    def __init__(
+        self,
+        did_document_path: Optional[str] = None,
+        private_key_path: Optional[str] = None,
+        **tool_options,
+    ):
+        """
+        Initialize the registry
+
+        Args:
+            did_document_path (str, optional): DID document path of the default identity
+            private_key_path (str, optional): Private key path of the default identity
+            **tool_options: Extra keyword arguments passed to every ANPTool, e.g. connector limits
+        """
+        self.default_identity = self._identity_key(did_document_path, private_key_path)
+        self.tool_options = tool_options
+        self._tools: Dict[Tuple[str, str], ANPTool] = {}
+
+    @staticmethod
+    def _identity_key(
+        did_document_path: Optional[str], private_key_path: Optional[str]
+    ) -> Tuple[str, str]:
+        """Build the registry key of a DID identity from its resolved file paths"""
+        did_document_path, private_key_path = ANPTool.resolve_did_paths(
+            did_document_path, private_key_path
+        )
+        return os.path.abspath(did_document_path), os.path.abspath(private_key_path)
+
+    def get(
+        self,
+        did_document_path: Optional[str] = None,
+        private_key_path: Optional[str] = None,
+    ) -> ANPTool:
+        """
+        Get the shared ANPTool of a DID identity, creating it on first use
+
+        Args:
+            did_document_path (str, optional): DID document path. If None, the default identity is used.
+            private_key_path (str, optional): Private key path. If None, the default identity is used.
+
+        Returns:
+            ANPTool: Shared tool for the identity
+        """
+        if did_document_path is None and private_key_path is None:
+            key = self.default_identity
+        else:
+            key = self._identity_key(did_document_path, private_key_path)
+
+        tool = self._tools.get(key)
+        if tool is None:
+            tool = ANPTool(
+                did_document_path=key[0], private_key_path=key[1], **self.tool_options
+            )
+            self._tools[key] = tool
+            logging.info(f"Registered ANPTool for DID document {key[0]}")
+        return tool
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get authentication metrics of all registered identities
+
+        Returns:
+            Dict[str, Any]: Totals and per-identity counts of bearer token reuse and fresh DID-WBA
+                signatures, coalesced request counts and response cache counters
+        """
+        identities = []
+        totals = {"token_reuse": 0, "did_signature": 0}
+        coalescing = {"upstream": 0, "coalesced_waiters": 0}
+        for (did_document_path, _), tool in self._tools.items():
+            for name, value in tool.auth_stats.items():
+                totals[name] = totals.get(name, 0) + value
+            for name, value in tool.coalescing_stats.items():
+                coalescing[name] = coalescing.get(name, 0) + value
+            identities.append(
+                {
+                    "did_document_path": did_document_path,
+                    "cached_token_domains": len(tool.auth_client.tokens),
+                    **tool.auth_stats,
+                }
+            )
+        metrics = {"auth": totals, "coalescing": coalescing, "identities": identities}
+        response_cache = self.tool_options.get("response_cache")
+        if response_cache is not None:
+            metrics["response_cache"] = dict(response_cache.stats)
+        return metrics
+
+    async def aclose(self) -> None:
+        """Close the HTTP sessions of all registered tools"""
+        for tool in self._tools.values():
+            await tool.aclose()
+        self._tools.clear()
+
+        response_cache = self.tool_options.get("response_cache")
+        if response_cache is not None:
+            response_cache.close()
@@ -1,8 +1,11 @@
+import itertools
+import json
 import logging
 import logging.handlers
 import os
 import sys
 from datetime import datetime
+from typing import Any, Dict, Mapping, Optional, Union
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -49,14 +52,24 @@ def get_project_name():
     return project_dir
 
 
-def setup_logging(level=logging.INFO, log_file=None, propagate=False):
+def setup_logging(level=logging.INFO, log_file=None, propagate=False, module_levels=None):
     """Set up logging with colored console output and file output.
     
     Args:
         level: The logging level, default is INFO
         log_file: The log file path, default is None (auto-generated)
         propagate: Whether to propagate logs to parent handlers, default is False
+        module_levels: Per-logger levels, e.g. {"anp_examples.anp_tool": "WARNING"}. Defaults to the
+            LOG_LEVELS environment variable ("anp_examples.anp_tool=WARNING,examples_code=DEBUG").
     """
+    if module_levels is None:
+        module_levels = parse_module_levels(os.getenv("LOG_LEVELS", ""))
+    configure_module_levels(module_levels)
+    # Handlers must let through records of modules configured below the root level
+    handler_level = min(
+        [_level_number(level)] + [_level_number(module_level) for module_level in module_levels.values()]
+    )
+
     # Create a formatter with datetime
     formatter = logging.Formatter('[%(asctime)s] %(levelname)-8s %(name)s: %(message)s', 
                                   '%Y-%m-%d %H:%M:%S')
@@ -112,14 +125,14 @@ def setup_logging(level=logging.INFO, log_file=None, propagate=False):
     
     # Configure colored console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(level)
+    console_handler.setLevel(handler_level)
     console_handler.setFormatter(colored_formatter)
     logger.addHandler(console_handler)
     
     # Configure file handler with the same format (but without color)
     try:
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(level)
+        file_handler.setLevel(handler_level)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
         
@@ -137,3 +150,196 @@ def setup_logging(level=logging.INFO, log_file=None, propagate=False):
 # For backward compatibility, keep the set_log_color_level function, but have it call setup_logging
 def set_log_color_level(level=logging.INFO):
     return setup_logging(level=level)
+
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """
+    Parse a "logger=LEVEL,logger=LEVEL" specification
+
+    Args:
+        spec: Comma separated logger=level pairs
+
+    Returns:
+        Dict[str, str]: Logger name -> level name
+    """
+    levels = {}
+    for part in spec.split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _level_number(level: Union[int, str]) -> int:
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(level.upper())
+    return number if isinstance(number, int) else logging.INFO
+
+
+def configure_module_levels(module_levels: Mapping[str, Union[int, str]]) -> None:
+    """Set the level of individual loggers, e.g. to silence one hot module"""
+    for name, level in module_levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+# Field names whose values never appear in log lines
+SECRET_FIELDS = frozenset(
+    {"authorization", "token", "signature", "private_key", "password", "secret", "api_key"}
+)
+
+# Longest field value written to a log line, longer values are cut
+MAX_FIELD_CHARS = 200
+
+
+def _format_value(name: str, value: Any, max_chars: int) -> str:
+    if name.lower() in SECRET_FIELDS:
+        length = len(value) if isinstance(value, (str, bytes)) else 0
+        return f"<redacted len={length}>"
+    if isinstance(value, (dict, list, tuple)):
+        text = json.dumps(value, ensure_ascii=False, default=str)
+    else:
+        text = str(value)
+    if len(text) > max_chars:
+        return f"{text[:max_chars]}...<{len(text)} chars>"
+    return text
+
+
+class _Fields:
+    """Log message whose text is only built when a handler formats the record"""
+
+    __slots__ = ("event", "fields", "max_chars")
+
+    def __init__(self, event: str, fields: Dict[str, Any], max_chars: int):
+        self.event = event
+        self.fields = fields
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.event
+        formatted = " ".join(
+            f"{name}={_format_value(name, value, self.max_chars)}"
+            for name, value in self.fields.items()
+        )
+        return f"{self.event} {formatted}"
+
+
+class StructuredLogger:
+    """
+    Level-gated, structured logging facade over a standard library logger.
+
+    Messages are an event name plus keyword fields. Nothing is formatted
+    unless the logger is enabled for the level, so hot paths pay only a level
+    check when the level is raised. Fields named like secrets (authorization,
+    token, signature, ...) are redacted and long values are truncated to
+    max_chars, so large payloads stay out of log lines unless a caller asks
+    for them explicitly with a higher max_chars. High-frequency events can be
+    sampled with sample_every=N, which emits one of every N occurrences.
+    """
+
+    def __init__(self, name: str, max_chars: int = MAX_FIELD_CHARS):
+        """
+        Initialize the facade
+
+        Args:
+            name: Logger name, usually the module's __name__
+            max_chars: Longest field value written to a log line
+        """
+        self.logger = logging.getLogger(name)
+        self.max_chars = max_chars
+        self._counters: Dict[str, "itertools.count"] = {}
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(
+        self,
+        level: int,
+        event: str,
+        sample_every: int = 1,
+        max_chars: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        """
+        Log an event
+
+        Args:
+            level: Logging level
+            event: Short event description
+            sample_every: Emit only one of every N occurrences of this event
+            max_chars: Longest field value, defaults to the facade's max_chars
+            **fields: Structured fields appended as name=value
+        """
+        self._log(level, event, sample_every, max_chars, fields)
+
+    def _log(
+        self,
+        level: int,
+        event: str,
+        sample_every: int,
+        max_chars: Optional[int],
+        fields: Dict[str, Any],
+    ) -> None:
+        """Log an event; only ever called directly by log() and the level helpers"""
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample_every > 1:
+            counter = self._counters.get(event)
+            if counter is None:
+                counter = self._counters[event] = itertools.count()
+            if next(counter) % sample_every:
+                return
+            fields["sampled"] = f"1/{sample_every}"
+        message = _Fields(event, fields, self.max_chars if max_chars is None else max_chars)
+        # Skip _log() and the public entry point, so the record points at its caller
+        self.logger.log(level, message, stacklevel=3)
+
+    def debug(
+        self,
+        event: str,
+        sample_every: int = 1,
+        max_chars: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        self._log(logging.DEBUG, event, sample_every, max_chars, fields)
+
+    def info(
+        self,
+        event: str,
+        sample_every: int = 1,
+        max_chars: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        self._log(logging.INFO, event, sample_every, max_chars, fields)
+
+    def warning(
+        self,
+        event: str,
+        sample_every: int = 1,
+        max_chars: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        self._log(logging.WARNING, event, sample_every, max_chars, fields)
+
+    def error(
+        self,
+        event: str,
+        sample_every: int = 1,
+        max_chars: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        self._log(logging.ERROR, event, sample_every, max_chars, fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    Get the structured logging facade of a module
+
+    Args:
+        name: Logger name, usually __name__
+
+    Returns:
+        StructuredLogger: Facade writing to logging.getLogger(name)
+    """
+    return StructuredLogger(name)
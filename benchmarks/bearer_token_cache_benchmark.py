@@ -0,0 +1,72 @@
+"""
+Microbenchmark: Bearer token verification with and without the verified-token cache.
+
+Issues TOKENS tokens signed with the example server's JWT key and verifies
+each of them CALLS_PER_TOKEN times through verify_bearer_token, once with
+BEARER_TOKEN_CACHE disabled (every call runs a full jwt.decode) and
+once with it enabled (only the first call per token does).
+
+Usage:
+    python -m benchmarks.bearer_token_cache_benchmark
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import jwt
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from examples_code import did_auth_middleware  # noqa: E402
+from examples_code.jwt_config import get_jwt_key_manager  # noqa: E402
+from examples_code.token_cache import VerifiedTokenCache  # noqa: E402
+
+TOKENS = 50
+CALLS_PER_TOKEN = 100
+
+
+def issue_tokens(count: int) -> list:
+    key_manager = get_jwt_key_manager()
+    kid, private_key = key_manager.signing_key()
+    now = datetime.now(timezone.utc)
+    return [
+        jwt.encode(
+            {"sub": f"did:wba:bench:user:{i}", "iat": now, "exp": now + timedelta(seconds=300)},
+            private_key,
+            algorithm=key_manager.algorithm(kid),
+            headers={"kid": kid},
+        )
+        for i in range(count)
+    ]
+
+
+async def run(tokens: list, cache) -> float:
+    did_auth_middleware.BEARER_TOKEN_CACHE = cache
+    start = time.perf_counter()
+    for _ in range(CALLS_PER_TOKEN):
+        for token in tokens:
+            await did_auth_middleware.verify_bearer_token(token)
+    elapsed = time.perf_counter() - start
+    return len(tokens) * CALLS_PER_TOKEN / elapsed
+
+
+async def main() -> None:
+    # Per-call INFO logging would dominate the measurement
+    logging.getLogger().setLevel(logging.WARNING)
+    tokens = issue_tokens(TOKENS)
+
+    uncached = await run(tokens, None)
+    cache = VerifiedTokenCache()
+    cached = await run(tokens, cache)
+
+    print(f"Tokens: {TOKENS}, verifications per token: {CALLS_PER_TOKEN}")
+    print(f"Uncached: {uncached:,.0f} verifications/s")
+    print(f"Cached:   {cached:,.0f} verifications/s  ({cached / uncached:.1f}x, stats {cache.stats})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
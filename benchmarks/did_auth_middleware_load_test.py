@@ -0,0 +1,120 @@
+"""
+Load test: pure-ASGI DIDAuthMiddleware vs the BaseHTTPMiddleware-based did_auth_middleware.
+
+Serves the routes of examples_code/server.py with uvicorn twice, once with
+the server's DIDAuthMiddleware and once with did_auth_middleware registered
+through app.middleware("http"), and sends REQUESTS Bearer-authenticated
+requests to /test with CONCURRENCY clients. The token is verified once and
+then served from the verified-token cache, so the difference between the
+runs is mostly the middleware plumbing.
+
+Usage:
+    python -m benchmarks.did_auth_middleware_load_test
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import aiohttp
+import jwt
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+
+from examples_code import server  # noqa: E402
+from examples_code.did_auth_middleware import did_auth_middleware  # noqa: E402
+from examples_code.jwt_config import get_jwt_key_manager  # noqa: E402
+
+PORT = 18941
+REQUESTS = 3000
+CONCURRENCY = 50
+
+
+def build_base_http_app() -> FastAPI:
+    """The example server's routes behind the BaseHTTPMiddleware-based middleware"""
+    app = FastAPI()
+    app.router.routes.extend(server.app.router.routes)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Authorization"],
+    )
+    app.middleware("http")(did_auth_middleware)
+    return app
+
+
+def issue_token() -> str:
+    key_manager = get_jwt_key_manager()
+    kid, private_key = key_manager.signing_key()
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {"sub": "did:wba:bench:user:alice", "iat": now, "exp": now + timedelta(seconds=300)},
+        private_key,
+        algorithm=key_manager.algorithm(kid),
+        headers={"kid": kid},
+    )
+
+
+async def client_once(session: aiohttp.ClientSession, url: str, headers: dict) -> None:
+    async with session.get(url, headers=headers) as response:
+        await response.read()
+
+
+async def run(app, token: str) -> float:
+    uv_server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="warning")
+    )
+    serve_task = asyncio.create_task(uv_server.serve())
+    while not uv_server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"http://127.0.0.1:{PORT}/test"
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = REQUESTS
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            async with session.get(url, headers=headers) as response:
+                assert response.status == 200, response.status
+                await response.read()
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            # Warm up connections and the verified-token cache
+            await client_once(session, url, headers)
+            start = time.perf_counter()
+            await asyncio.gather(*(client(session) for _ in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+    finally:
+        uv_server.should_exit = True
+        await serve_task
+    return REQUESTS / elapsed
+
+
+async def main() -> None:
+    # The example routes log every request at INFO, which would dominate the measurement
+    logging.disable(logging.INFO)
+    token = issue_token()
+
+    base_http = await run(build_base_http_app(), token)
+    pure_asgi = await run(server.app, token)
+
+    print(f"Requests: {REQUESTS}, concurrency: {CONCURRENCY}")
+    print(f"BaseHTTPMiddleware: {base_http:,.0f} req/s")
+    print(f"Pure ASGI:          {pure_asgi:,.0f} req/s  ({pure_asgi / base_http:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+Benchmark: building the document tree of synthetic crawls from crawl edges.
+
+Crawls a synthetic agent-description site of N documents (each document
+links to FANOUT children plus CROSS_LINKS random other documents) with
+DocTreeCrawler and a fake ANPTool, then builds the tree twice: with the
+previous process_doc_tree, which searches the stringified content of
+every other document for each URL, and with build_doc_graph over the
+recorded crawl edges. "wrong parents" counts documents the substring
+search attached to a document other than the one they were discovered
+from (e.g. ".../doc-12" matching a document that links ".../doc-123").
+The substring search is quadratic, so the 10k run takes a few minutes.
+
+Usage:
+    python -m benchmarks.doc_graph_benchmark
+"""
+
+import asyncio
+import gc
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from anp_examples.doc_crawler import DocTreeCrawler  # noqa: E402
+from anp_examples.doc_graph import build_doc_graph  # noqa: E402
+
+BASE_URL = "https://agents.example.com/doc-"
+SIZES = [1000, 2000, 5000, 10000]
+FANOUT = 4
+CROSS_LINKS = 2
+
+
+class FakeANPTool:
+    """Serves the synthetic documents from memory"""
+
+    def __init__(self, documents: dict):
+        self.documents = documents
+
+    async def execute(self, url: str) -> dict:
+        return self.documents[url]
+
+
+def build_site(size: int) -> dict:
+    rng = random.Random(size)
+    documents = {}
+    for index in range(size):
+        children = range(index * FANOUT + 1, min(size, index * FANOUT + FANOUT + 1))
+        cross = [rng.randrange(size) for _ in range(CROSS_LINKS)]
+        documents[f"{BASE_URL}{index}"] = {
+            "@id": f"{BASE_URL}{index}",
+            "name": f"Agent document {index}",
+            "description": "Synthetic agent description used for benchmarking. " * 4,
+            "interfaces": [
+                {"type": "StructuredInterface", "url": f"{BASE_URL}{child}"}
+                for child in list(children) + cross
+            ],
+        }
+    return documents
+
+
+def extract_links(document: dict) -> list:
+    return [interface["url"] for interface in document["interfaces"]]
+
+
+def legacy_process_doc_tree(documents):
+    """The previous process_doc_tree: substring search over every other document"""
+    doc_tree = {"name": "Root Node", "children": []}
+    url_map = {}
+    for doc in documents:
+        url = doc["url"]
+        node = {"name": url.split("/")[-1], "url": url, "children": [], "doc": doc}
+        url_map[url] = node
+        if doc == documents[0]:
+            doc_tree["children"].append(node)
+
+    for doc in documents[1:]:
+        url = doc["url"]
+        node = url_map[url]
+        found_parent = False
+        for parent_doc in documents:
+            parent_url = parent_doc["url"]
+            if parent_url == url:
+                continue
+            if url in str(parent_doc["content"]):
+                url_map[parent_url]["children"].append(node)
+                found_parent = True
+                break
+        if not found_parent:
+            doc_tree["children"].append(node)
+    return doc_tree
+
+
+def parents_of(doc_tree: dict) -> dict:
+    parents = {}
+    stack = [(None, node) for node in doc_tree["children"]]
+    while stack:
+        parent, node = stack.pop()
+        parents[node["url"]] = parent
+        stack.extend((node["url"], child) for child in node["children"])
+    return parents
+
+
+async def crawl(size: int) -> DocTreeCrawler:
+    crawler = DocTreeCrawler(
+        FakeANPTool(build_site(size)), extract_links, max_level=size, max_docs=size
+    )
+    await crawler.crawl(f"{BASE_URL}0")
+    return crawler
+
+
+async def main() -> None:
+    logging.disable(logging.INFO)
+    print(
+        f"{'documents':>10}{'edges':>8}{'substring':>12}{'edges O(n+e)':>14}"
+        f"{'speedup':>10}{'wrong parents':>15}"
+    )
+    for size in SIZES:
+        crawler = await crawl(size)
+        documents, edges = crawler.crawled_documents, crawler.edges
+
+        gc.collect()
+        linear = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            doc_graph = build_doc_graph(documents, edges)
+            linear = min(linear, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        legacy_tree = legacy_process_doc_tree(documents)
+        legacy = time.perf_counter() - start
+
+        expected = parents_of(doc_graph["doc_tree"])
+        assert expected == {
+            url: parent for url, parent in crawler.discovered_from.items() if url in expected
+        }
+        wrong = sum(
+            1 for url, parent in parents_of(legacy_tree).items() if parent != expected[url]
+        )
+        print(
+            f"{len(documents):>10}{len(edges):>8}{legacy * 1000:>10,.0f}ms"
+            f"{linear * 1000:>12,.1f}ms{legacy / linear:>9,.0f}x{wrong:>15}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
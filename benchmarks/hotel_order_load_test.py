@@ -0,0 +1,110 @@
+"""
+Load test: hotel order calls must not block unrelated traffic.
+
+Starts a fake agent-connect.ai upstream that answers after UPSTREAM_DELAY
+seconds and the ANP Network Explorer backend with uvicorn, then sends
+concurrent order detail calls together with unrelated requests. The
+unrelated requests go to /api/health, which shares the event loop with
+/api/query but needs no LLM. With a blocking upstream client every order
+call stalls the loop, so the unrelated latency grows to roughly
+ORDER_CALLS x UPSTREAM_DELAY; with the async client it stays in
+milliseconds.
+
+Usage:
+    python -m benchmarks.hotel_order_load_test
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+UPSTREAM_PORT = 18931
+BACKEND_PORT = 18932
+UPSTREAM_DELAY = 0.5
+ORDER_CALLS = 10
+UNRELATED_CALLS = 20
+
+os.environ["HOTEL_ORDER_API_BASE_URL"] = f"http://127.0.0.1:{UPSTREAM_PORT}"
+# simple_example validates the LLM configuration on import
+for name in ("DASHSCOPE_API_KEY", "DASHSCOPE_BASE_URL", "DASHSCOPE_MODEL_NAME"):
+    os.environ.setdefault(name, "load-test")
+
+import uvicorn  # noqa: E402
+
+from web_app.backend.anp_examples_backend import app  # noqa: E402
+
+
+async def start_fake_upstream() -> web.AppRunner:
+    async def order_detail(request: web.Request) -> web.Response:
+        await asyncio.sleep(UPSTREAM_DELAY)
+        return web.json_response({"success": True, "msg": "ok", "data": {"status": "paid"}})
+
+    upstream = web.Application()
+    upstream.router.add_post("/agents/travel/hotel/api/get_order_detail/ph", order_detail)
+    runner = web.AppRunner(upstream)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", UPSTREAM_PORT).start()
+    return runner
+
+
+async def timed(coro) -> float:
+    start = time.perf_counter()
+    await coro
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    upstream = await start_fake_upstream()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=BACKEND_PORT, log_level="warning")
+    )
+    server_task = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{BACKEND_PORT}"
+    async with aiohttp.ClientSession() as session:
+
+        async def order_call():
+            async with session.post(
+                f"{base_url}/api/travel/hotel/order/get_detail",
+                json={"customerOrderNo": "load-test"},
+            ) as response:
+                await response.read()
+
+        async def health_call():
+            async with session.get(f"{base_url}/api/health") as response:
+                await response.read()
+
+        async def unrelated_call() -> float:
+            # Let the order calls reach the upstream first
+            await asyncio.sleep(0.05)
+            return await timed(health_call())
+
+        start = time.perf_counter()
+        order_times, unrelated_times = await asyncio.gather(
+            asyncio.gather(*(timed(order_call()) for _ in range(ORDER_CALLS))),
+            asyncio.gather(*(unrelated_call() for _ in range(UNRELATED_CALLS))),
+        )
+        elapsed = time.perf_counter() - start
+
+    print(f"{ORDER_CALLS} order calls with {UPSTREAM_DELAY}s upstream delay, {UNRELATED_CALLS} unrelated calls")
+    print(f"  wall time:                 {elapsed:.3f}s (serialized order calls would need {ORDER_CALLS * UPSTREAM_DELAY:.1f}s)")
+    print(f"  order call latency max:    {max(order_times):.3f}s")
+    print(f"  unrelated latency max:     {max(unrelated_times) * 1000:.1f}ms")
+    print(f"  unrelated latency average: {sum(unrelated_times) / len(unrelated_times) * 1000:.1f}ms")
+
+    server.should_exit = True
+    await server_task
+    await upstream.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
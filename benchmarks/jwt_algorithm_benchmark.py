@@ -0,0 +1,57 @@
+"""
+Benchmark: JWT sign and verify throughput per signing algorithm.
+
+For every algorithm in SUPPORTED_ALGORITHMS a fresh key pair is generated
+and the same DID-auth payload is signed and verified ITERATIONS times with
+PyJWT, the way generate_did_auth_token and verify_bearer_token do it. Use
+the result to choose JWT_ALGORITHM for the example server.
+
+Usage:
+    python -m benchmarks.jwt_algorithm_benchmark
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import jwt
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from examples_code.jwt_config import (  # noqa: E402
+    SUPPORTED_ALGORITHMS,
+    generate_jwt_private_key,
+)
+
+ITERATIONS = 2000
+
+
+def ops_per_second(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    now = datetime.now(timezone.utc)
+    payload = {"sub": "did:wba:bench:user:alice", "iat": now, "exp": now + timedelta(seconds=300)}
+
+    print(f"{'algorithm':<10}{'sign ops/s':>14}{'verify ops/s':>16}{'token bytes':>14}")
+    for algorithm in SUPPORTED_ALGORITHMS:
+        private_key = generate_jwt_private_key(algorithm)
+        public_key = private_key.public_key()
+        token = jwt.encode(payload, private_key, algorithm=algorithm)
+
+        sign = ops_per_second(
+            lambda: jwt.encode(payload, private_key, algorithm=algorithm), ITERATIONS
+        )
+        verify = ops_per_second(
+            lambda: jwt.decode(token, public_key, algorithms=[algorithm]), ITERATIONS
+        )
+        print(f"{algorithm:<10}{sign:>14,.0f}{verify:>16,.0f}{len(token):>14}")
+
+
+if __name__ == "__main__":
+    main()
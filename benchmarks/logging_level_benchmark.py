@@ -0,0 +1,157 @@
+"""
+Benchmark: DID-auth requests per second with logging at INFO vs WARNING.
+
+Serves examples_code/server.py with uvicorn and sends REQUESTS requests to
+/test with CONCURRENCY clients, once with setup_logging at INFO and once at
+WARNING (best of ROUNDS alternating runs), both writing to a temporary log
+file. Two workloads are measured: Bearer requests (token served from the
+verified-token cache) and DID-WBA handshakes (signature verification plus
+token issue), which log the most per request.
+
+Usage:
+    python -m benchmarks.logging_level_benchmark
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import aiohttp
+import jwt
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import uvicorn  # noqa: E402
+from agent_connect.authentication import (  # noqa: E402
+    generate_auth_header,
+    verify_auth_header_signature,
+)
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import ec  # noqa: E402
+
+from anp_examples.utils.log_base import setup_logging  # noqa: E402
+from examples_code import did_auth_middleware, server  # noqa: E402
+from examples_code.jwt_config import get_jwt_key_manager  # noqa: E402
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DID_DOCUMENT_PATH = ROOT_DIR / "use_did_test_public" / "did.json"
+PRIVATE_KEY_PATH = ROOT_DIR / "use_did_test_public" / "key-1_private.pem"
+PORT = 18942
+DOMAIN = "127.0.0.1"
+REQUESTS = 2000
+CONCURRENCY = 50
+ROUNDS = 3
+
+
+def issue_token() -> str:
+    key_manager = get_jwt_key_manager()
+    kid, private_key = key_manager.signing_key()
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {"sub": "did:wba:bench:user:alice", "iat": now, "exp": now + timedelta(seconds=300)},
+        private_key,
+        algorithm=key_manager.algorithm(kid),
+        headers={"kid": kid},
+    )
+
+
+def build_auth_headers(did_document: dict, count: int) -> list:
+    private_key = serialization.load_pem_private_key(PRIVATE_KEY_PATH.read_bytes(), password=None)
+
+    def sign(content: bytes, method_fragment: str) -> bytes:
+        return private_key.sign(content, ec.ECDSA(hashes.SHA256()))
+
+    headers = []
+    while len(headers) < count:
+        header = generate_auth_header(did_document, DOMAIN, sign)
+        # agent_connect does not pad R|S to a fixed width, so a small share of
+        # generated signatures never verifies; leave those out
+        if verify_auth_header_signature(header, did_document, DOMAIN)[0]:
+            headers.append(header)
+    return headers
+
+
+async def run(authorizations: list) -> float:
+    uv_server = uvicorn.Server(
+        uvicorn.Config(server.app, host=DOMAIN, port=PORT, log_level="warning")
+    )
+    serve_task = asyncio.create_task(uv_server.serve())
+    while not uv_server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"http://{DOMAIN}:{PORT}/test"
+    queue = list(authorizations)
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        while queue:
+            headers = {"Authorization": queue.pop()}
+            async with session.get(url, headers=headers) as response:
+                assert response.status == 200, response.status
+                await response.read()
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            start = time.perf_counter()
+            await asyncio.gather(*(client(session) for _ in range(CONCURRENCY)))
+            elapsed = time.perf_counter() - start
+    finally:
+        uv_server.should_exit = True
+        await serve_task
+    return len(authorizations) / elapsed
+
+
+async def measure(level: int, log_file: str, bearer: list, handshakes: list) -> tuple:
+    logger = setup_logging(level, log_file=log_file)
+    # Measure the file handler only, keep the console quiet
+    for handler in logger.handlers[:]:
+        if not isinstance(handler, logging.FileHandler):
+            logger.removeHandler(handler)
+    return await run(bearer), await run(handshakes)
+
+
+async def main() -> None:
+    did_document = json.loads(DID_DOCUMENT_PATH.read_text())
+
+    async def resolve_locally(did: str) -> dict:
+        return did_document
+
+    did_auth_middleware.DID_DOCUMENT_CACHE.resolver = resolve_locally
+    bearer = [f"Bearer {issue_token()}"] * REQUESTS
+    # A nonce is accepted only once, so every run gets its own handshakes
+    logging.disable(logging.INFO)
+    handshakes = build_auth_headers(did_document, REQUESTS * ROUNDS * 2)
+    logging.disable(logging.NOTSET)
+    did_auth_middleware.CRYPTO_EXECUTOR.max_queue = CONCURRENCY * 2
+
+    # Best of ROUNDS alternating runs per level
+    best = {logging.INFO: [0.0, 0.0], logging.WARNING: [0.0, 0.0]}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = str(Path(tmp_dir) / "benchmark.log")
+        # Warm up connections, the DID document cache and the verified-token cache
+        await measure(logging.WARNING, log_file, bearer[:100], [])
+        for _ in range(ROUNDS):
+            for level in (logging.INFO, logging.WARNING):
+                batch, handshakes = handshakes[:REQUESTS], handshakes[REQUESTS:]
+                result = await measure(level, log_file, bearer, batch)
+                best[level] = [max(pair) for pair in zip(best[level], result)]
+    info, warning = best[logging.INFO], best[logging.WARNING]
+
+    print(f"Requests per workload: {REQUESTS}, concurrency: {CONCURRENCY}")
+    print(f"{'workload':>12}{'INFO':>14}{'WARNING':>14}")
+    for name, at_info, at_warning in (
+        ("bearer", info[0], warning[0]),
+        ("handshake", info[1], warning[1]),
+    ):
+        print(
+            f"{name:>12}{at_info:>10,.0f}/s  {at_warning:>10,.0f}/s  "
+            f"({at_warning / at_info:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
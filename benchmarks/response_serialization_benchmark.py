@@ -0,0 +1,138 @@
+"""
+Benchmark: serializing /api/agent-doc-tree responses with detail=full.
+
+Builds crawl results from the recorded agent description documents in
+ad-json/ (hotel and room JSON-LD, the OpenAPI YAML interfaces wrapped the
+way ANPTool returns them) repeated under distinct URLs, and serves each
+result from routes of an in-process app, timing full requests through
+TestClient:
+
+- response_model: the dict returned through response_model=AgentDocTreeResponse,
+  serialized by the installed FastAPI (recent versions validate and dump
+  to JSON in pydantic-core)
+- jsonable_encoder: validation, model_dump and jsonable_encoder rendered
+  by JSONResponse, the pipeline of the FastAPI 0.105 line in pyproject.toml
+- FastJSONResponse, which the crawl endpoints return, with orjson (a
+  declared dependency) and with the json module it falls back to when
+  orjson is missing
+
+Usage:
+    python -m benchmarks.response_serialization_benchmark
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from anp_examples.doc_graph import build_doc_graph  # noqa: E402
+from web_app.backend import json_response  # noqa: E402
+from web_app.backend.json_response import FastJSONResponse  # noqa: E402
+from web_app.backend.models import AgentDocTreeResponse  # noqa: E402
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+FIXTURE_DIR = ROOT_DIR / "ad-json"
+BASE_URL = "https://agent-connect.ai/agents/travel/hotel"
+SIZES = [30, 100, 300]
+REQUESTS = 20
+
+
+def load_fixtures() -> list:
+    """Recorded documents in the shape ANPTool.execute returns them"""
+    fixtures = []
+    for path in sorted(FIXTURE_DIR.glob("*.json")):
+        content = json.loads(path.read_text(encoding="utf-8"))
+        content.update(content_type="application/json", status_code=200)
+        fixtures.append(content)
+    for path in sorted((FIXTURE_DIR / "api").glob("*.yaml")):
+        text = path.read_text(encoding="utf-8")
+        try:
+            content = {"data": yaml.safe_load(text), "format": "yaml"}
+        except yaml.YAMLError:
+            content = {"text": text, "format": "text"}
+        content.update(content_type="application/yaml", status_code=200)
+        fixtures.append(content)
+    return fixtures
+
+
+def build_payload(size: int) -> dict:
+    fixtures = load_fixtures()
+    documents = []
+    for index in range(size):
+        url = f"{BASE_URL}/{index}/ad.json"
+        content = dict(fixtures[index % len(fixtures)], url=url)
+        documents.append({"url": url, "method": "GET", "content": content})
+    # A tree with fanout 4: document i is discovered from document (i - 1) // 4
+    edges = [(documents[(i - 1) // 4]["url"], documents[i]["url"]) for i in range(1, size)]
+    doc_graph = build_doc_graph(documents, edges)
+    return {
+        "doc_tree": doc_graph["doc_tree"],
+        "links": doc_graph["links"],
+        "visited_urls": [doc["url"] for doc in documents],
+        "crawled_documents": documents,
+    }
+
+
+def build_app(payload: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=AgentDocTreeResponse)
+    async def response_model():
+        return payload
+
+    @app.get("/jsonable-encoder")
+    async def encoder():
+        model = AgentDocTreeResponse.model_validate(payload)
+        return JSONResponse(jsonable_encoder(model.model_dump()))
+
+    @app.get("/fast")
+    async def fast():
+        return FastJSONResponse(payload)
+
+    return app
+
+
+def measure(client: TestClient, path: str) -> tuple:
+    client.get(path)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = client.get(path)
+    elapsed = (time.perf_counter() - start) / REQUESTS
+    return elapsed * 1000, len(response.content)
+
+
+def main() -> None:
+    orjson_module = json_response.orjson
+    if orjson_module is None:
+        print("orjson is not installed, the orjson column uses the json module")
+    print(f"Requests per route: {REQUESTS}, times per request")
+    print(
+        f"{'documents':>10}{'body':>10}{'response_model':>16}{'jsonable_encoder':>18}"
+        f"{'json':>10}{'orjson':>10}"
+    )
+    for size in SIZES:
+        payload = build_payload(size)
+        with TestClient(build_app(payload)) as client:
+            model, body = measure(client, "/response-model")
+            encoder, _ = measure(client, "/jsonable-encoder")
+            json_response.orjson = None
+            fast_json, _ = measure(client, "/fast")
+            json_response.orjson = orjson_module
+            fast_orjson, _ = measure(client, "/fast")
+        print(
+            f"{size:>10}{body / 1024:>7,.0f} KB{model:>14,.1f}ms{encoder:>16,.1f}ms"
+            f"{fast_json:>8,.1f}ms{fast_orjson:>8,.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
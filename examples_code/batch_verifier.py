@@ -0,0 +1,135 @@
+"""
+DID-WBA 握手签名的批量验证。
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from examples_code.crypto_executor import CryptoExecutor
+from examples_code.verification_key_cache import VerificationKeyCache, verify_auth_header
+
+# (认证头, DID 文档, 服务器域名)
+VerifyItem = Tuple[str, Dict, str]
+
+
+def verify_batch(items: List[VerifyItem]) -> List[Tuple[bool, str]]:
+    """
+    验证一批 DID 认证头，同一个 DID 文档的公钥只解析一次
+
+    只接收可以 pickle 的参数，可以在进程池中运行。
+
+    Args:
+        items: 待验证的 (认证头, DID 文档, 服务器域名) 列表
+
+    Returns:
+        List[Tuple[bool, str]]: 与 items 一一对应的验证结果
+    """
+    # DID -> 该 DID 文档已解析的验证对象
+    verifiers_by_did: Dict[str, Dict[str, Any]] = {}
+    results = []
+    for authorization, did_document, domain in items:
+        verifiers = verifiers_by_did.setdefault(did_document.get("id") or "", {})
+        results.append(verify_auth_header(authorization, did_document, domain, verifiers))
+    return results
+
+
+class BatchSignatureVerifier:
+    """
+    微批量签名验证器
+
+    握手请求的验签先进入等待列表，整批提交给执行器，在一个任务中按 DID 文档
+    分组验证，再把结果分别返回给每个等待的请求。没有批次在执行时，等待列表在
+    当前事件循环迭代结束时立即提交，单个握手不会多等；已有批次在执行时，新请求
+    最多等待 max_delay 秒（或攒满 max_batch 个）再提交。并发握手很多时，每次
+    验签的执行器调度开销和公钥解析都被摊薄。
+    """
+
+    def __init__(
+        self,
+        executor: CryptoExecutor,
+        max_delay: float = 0.002,
+        max_batch: int = 64,
+        key_cache: Optional[VerificationKeyCache] = None,
+    ):
+        """
+        初始化验证器
+
+        Args:
+            executor: 执行批量验证的执行器
+            max_delay: 第一个请求到达后最多等待多久提交（秒）
+            max_batch: 每批最多验证的请求数
+            key_cache: 跨批次复用的公钥缓存，只能用于线程池执行器
+        """
+        self.executor = executor
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.key_cache = key_cache
+
+        self._pending: List[Tuple[VerifyItem, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._running = 0
+        self.stats: Dict[str, int] = {"batches": 0, "verified": 0, "max_batch_size": 0}
+
+    async def verify(self, authorization: str, did_document: Dict, domain: str) -> Tuple[bool, str]:
+        """
+        验证一个 DID 认证头
+
+        Args:
+            authorization: DID 认证头
+            did_document: DID 文档
+            domain: 服务器域名
+
+        Returns:
+            Tuple[bool, str]: (是否验证成功, 说明)
+
+        Raises:
+            CryptoExecutorBusyError: 执行器队列已满
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((authorization, did_document, domain), future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self._running == 0:
+                # 同一轮事件循环中到达的请求合并为一批
+                self._flush_handle = loop.call_soon(self._flush)
+            else:
+                self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._running += 1
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[VerifyItem, asyncio.Future]]) -> None:
+        self.stats["batches"] += 1
+        self.stats["verified"] += len(batch)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        try:
+            batch_func = self.key_cache.verify_batch if self.key_cache is not None else verify_batch
+            results = await self.executor.run(
+                "verify_batch", batch_func, [item for item, _ in batch]
+            )
+        except Exception as e:
+            logging.error(f"Batch signature verification failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._running -= 1
+            # 上一批完成后立即提交期间积累的请求
+            if self._pending and self._running == 0:
+                self._flush()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,134 @@
+"""
+认证路径上 CPU 密集的签名/验签操作的执行器，避免阻塞事件循环。
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import time
+from typing import Any, Callable, Dict
+
+
+class CryptoExecutorBusyError(Exception):
+    """执行器的等待队列已满"""
+
+    def __init__(self, retry_after_seconds: int):
+        super().__init__("Crypto executor queue is full")
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CryptoExecutor:
+    """
+    把签名和验签放到线程池或进程池中执行
+
+    同时执行的操作数为 max_workers，另外最多 max_queue 个操作排队等待。
+    队列已满时 run 立即抛出 CryptoExecutorBusyError，调用方应返回 503 并带上
+    Retry-After，而不是让请求无限堆积。进程池模式下提交的函数和参数必须可以
+    pickle，因此签名通过 jwt_config.sign_jwt 在子进程中按 kid 取密钥。
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+        retry_after_seconds: int = 1,
+    ):
+        """
+        初始化执行器
+
+        Args:
+            kind: "thread" 使用线程池，"process" 使用进程池
+            max_workers: 并发执行的操作数
+            max_queue: 最多排队等待的操作数
+            retry_after_seconds: 队列已满时建议客户端重试的等待时间（秒）
+        """
+        if kind == "thread":
+            self.executor: concurrent.futures.Executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="did-auth-crypto"
+            )
+        elif kind == "process":
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unsupported executor kind: {kind}")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+
+        self._pending = 0
+        self.rejected = 0
+        # 操作名 -> 次数、总耗时、最大耗时（包含排队时间）
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """正在排队、尚未开始执行的操作数"""
+        return max(0, self._pending - self.max_workers)
+
+    async def run(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在执行器中运行一个操作
+
+        Args:
+            operation: 操作名，用于统计，例如 "verify"、"sign"
+            func: 要执行的函数
+            *args: 函数参数
+
+        Returns:
+            Any: 函数的返回值
+
+        Raises:
+            CryptoExecutorBusyError: 等待队列已满
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logging.warning(
+                f"Crypto executor queue full, rejecting {operation} (pending={self._pending})"
+            )
+            raise CryptoExecutorBusyError(self.retry_after_seconds)
+
+        self._pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._pending -= 1
+            elapsed = time.perf_counter() - start
+            stats = self._latency.setdefault(
+                operation, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["count"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        获取执行器指标
+
+        Returns:
+            Dict[str, Any]: 队列深度、拒绝次数以及每种操作的次数和平均/最大耗时（毫秒）
+        """
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "latency_ms": {
+                operation: {
+                    "count": int(stats["count"]),
+                    "avg": round(stats["total_seconds"] / stats["count"] * 1000, 3),
+                    "max": round(stats["max_seconds"] * 1000, 3),
+                }
+                for operation, stats in self._latency.items()
+                if stats["count"]
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭线程池或进程池"""
+        self.executor.shutdown(wait=wait)
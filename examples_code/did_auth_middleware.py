@@ -5,7 +5,8 @@ import logging
 import traceback
 from fastapi import Request, HTTPException, Header
 from fastapi.responses import JSONResponse
-from typing import Optional, Tuple, Dict
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Any, Iterable, Optional, Tuple, Dict
 import asyncio
 
 from agent_connect.authentication import (
@@ -13,7 +14,17 @@ from agent_connect.authentication import (
     resolve_did_wba_document,
     extract_auth_header_parts,
 )
-from examples_code.jwt_config import get_jwt_private_key, get_jwt_public_key
+from anp_examples.utils.log_base import get_logger
+from examples_code.jwt_config import get_jwt_key_manager, sign_jwt
+from examples_code.crypto_executor import CryptoExecutor, CryptoExecutorBusyError
+from examples_code.batch_verifier import BatchSignatureVerifier
+from examples_code.verification_key_cache import VerificationKeyCache
+from examples_code.did_document_cache import DIDDocumentCache
+from examples_code.nonce_store import InMemoryNonceStore, NonceStore, NonceStoreFullError
+from examples_code.token_cache import VerifiedTokenCache
+
+# 请求路径上的日志：未开启对应级别时不做任何格式化，认证头和 token 默认脱敏
+log = get_logger(__name__)
 
 # 定义豁免路径
 EXEMPT_PATHS = [
@@ -26,20 +37,93 @@ EXEMPT_PATHS = [
     "/wba/demo/auth",
 ]
 
+# 预编译的豁免路径集合，O(1) 查找
+EXEMPT_PATH_SET = frozenset(EXEMPT_PATHS)
+
 # 时间戳过期时间（分钟）
 TIMESTAMP_EXPIRATION_MINUTES = 5
 
 # nonce 过期时间（分钟）
 NONCE_EXPIRATION_MINUTES = 6
 
-# 添加全局变量来存储已使用的 nonce
-USED_NONCES: Dict[str, Dict[str, datetime]] = {}
+# nonce 存储容量上限
+NONCE_STORE_MAX_ENTRIES = 100000
+
+# 后台清理过期 nonce 的间隔（秒）
+CLEANUP_INTERVAL_SECONDS = 10
+
+# 已使用的 nonce 存储，多 worker 部署时可通过 set_nonce_store 换成 RedisNonceStore
+NONCE_STORE: NonceStore = InMemoryNonceStore(
+    ttl_seconds=NONCE_EXPIRATION_MINUTES * 60,
+    max_entries=NONCE_STORE_MAX_ENTRIES,
+    cleanup_interval_seconds=CLEANUP_INTERVAL_SECONDS,
+)
+
+# DID 文档缓存时间（秒）
+DID_DOCUMENT_CACHE_TTL_SECONDS = 300
+
+# 无法解析的 DID 的缓存时间（秒）
+DID_DOCUMENT_NEGATIVE_TTL_SECONDS = 30
+
+# DID 文档过期后仍可使用并后台刷新的时间（秒）
+DID_DOCUMENT_STALE_SECONDS = 600
+
+# 最多缓存的 DID 文档数量
+DID_DOCUMENT_CACHE_MAX_ENTRIES = 1024
+
+# 已解析的 DID 文档缓存
+DID_DOCUMENT_CACHE = DIDDocumentCache(
+    resolver=resolve_did_wba_document,
+    ttl=DID_DOCUMENT_CACHE_TTL_SECONDS,
+    negative_ttl=DID_DOCUMENT_NEGATIVE_TTL_SECONDS,
+    stale_ttl=DID_DOCUMENT_STALE_SECONDS,
+    max_entries=DID_DOCUMENT_CACHE_MAX_ENTRIES,
+)
+
+# 已验证 Bearer token 缓存的容量
+BEARER_TOKEN_CACHE_MAX_ENTRIES = 10000
+
+# 已验证的 Bearer token 缓存，设为 None 则每次都做完整的签名验证。
+# 命中时按 kid 检查公钥，密钥删除或轮换后旧 token 需要重新验证
+BEARER_TOKEN_CACHE: Optional[VerifiedTokenCache] = VerifiedTokenCache(
+    max_entries=BEARER_TOKEN_CACHE_MAX_ENTRIES,
+    key_lookup=lambda kid: get_jwt_key_manager().verification_key(kid),
+)
+
+# 签名/验签执行器类型：thread 或 process
+CRYPTO_EXECUTOR_KIND = os.environ.get("DID_AUTH_EXECUTOR", "thread")
+
+# 签名/验签的并发数
+CRYPTO_EXECUTOR_WORKERS = int(os.environ.get("DID_AUTH_EXECUTOR_WORKERS", "4"))
+
+# 最多排队等待签名/验签的请求数，超出后返回 503
+CRYPTO_EXECUTOR_MAX_QUEUE = int(os.environ.get("DID_AUTH_EXECUTOR_MAX_QUEUE", "64"))
+
+# 签名/验签执行器，避免 CPU 密集操作阻塞事件循环
+CRYPTO_EXECUTOR = CryptoExecutor(
+    kind=CRYPTO_EXECUTOR_KIND,
+    max_workers=CRYPTO_EXECUTOR_WORKERS,
+    max_queue=CRYPTO_EXECUTOR_MAX_QUEUE,
+)
 
-# 添加全局变量记录上次清理时间
-LAST_CLEANUP_TIME: datetime = datetime.now(timezone.utc)
+# 已解析公钥的缓存，随 DID 文档一起失效；进程池模式下各子进程无法共享，不使用
+VERIFICATION_KEY_CACHE: Optional[VerificationKeyCache] = (
+    VerificationKeyCache(max_dids=DID_DOCUMENT_CACHE_MAX_ENTRIES)
+    if CRYPTO_EXECUTOR_KIND == "thread"
+    else None
+)
+if VERIFICATION_KEY_CACHE is not None:
+    DID_DOCUMENT_CACHE.add_listener(VERIFICATION_KEY_CACHE.invalidate)
+
+# 是否批量验证 DID-WBA 握手签名（适合大量代理同时连接的场景）
+BATCH_VERIFICATION_ENABLED = os.environ.get("DID_AUTH_BATCH_VERIFY", "").lower() in ("1", "true", "yes")
 
-# 清理间隔（秒）
-CLEANUP_INTERVAL_SECONDS = 60
+# 握手签名的批量验证器，为 None 时每个握手单独验证
+SIGNATURE_VERIFIER: Optional[BatchSignatureVerifier] = (
+    BatchSignatureVerifier(CRYPTO_EXECUTOR, key_cache=VERIFICATION_KEY_CACHE)
+    if BATCH_VERIFICATION_ENABLED
+    else None
+)
 
 # 定义允许的服务器域名列表
 WBA_SERVER_DOMAINS = [
@@ -111,63 +195,60 @@ def get_and_validate_domain(request: Request) -> str:
         raise HTTPException(status_code=400, detail="Invalid domain")
 
 
-async def cleanup_expired_nonces():
-    """清理过期的 nonce 记录"""
-    try:
-        current_time = datetime.now(timezone.utc)
-        expiration_time = current_time - timedelta(minutes=NONCE_EXPIRATION_MINUTES)
-
-        # 清理已使用的过期 nonce
-        cleaned_count = 0
-        for did in list(USED_NONCES.keys()):
-            expired_did_nonces = [
-                n
-                for n, t in USED_NONCES[did].items()
-                if current_time - t > timedelta(minutes=NONCE_EXPIRATION_MINUTES)
-            ]
-            for expired_nonce in expired_did_nonces:
-                USED_NONCES[did].pop(expired_nonce)
-                cleaned_count += 1
-
-            # 如果 DID 的所有 nonce 都已过期，删除整个 DID 条目
-            if not USED_NONCES[did]:
-                USED_NONCES.pop(did)
-
-        # 数据库清理操作（注释掉）
-        """
-        cleanup_query = '''
-            DELETE FROM nonces 
-            WHERE created_at < %s
-        '''
-        execute_query(cleanup_query, expiration_time)
-        """
+def invalidate_did_document(did: str) -> bool:
+    """
+    使缓存的 DID 文档失效，DID 的密钥轮换后调用
 
-        if cleaned_count > 0:
-            logging.info(f"Cleaned up {cleaned_count} expired nonces")
+    Args:
+        did: DID 标识符
 
-        # 更新上次清理时间
-        global LAST_CLEANUP_TIME
-        LAST_CLEANUP_TIME = current_time
+    Returns:
+        bool: 是否存在被删除的缓存
+    """
+    return DID_DOCUMENT_CACHE.invalidate(did)
 
-    except Exception as e:
-        logging.error(f"Error during nonce cleanup: {e}")
-        logging.error("Stack trace:")
-        traceback.print_exc()
 
+def get_auth_metrics() -> Dict[str, Any]:
+    """
+    获取认证路径的指标
+
+    Returns:
+        Dict[str, Any]: 签名/验签执行器的队列深度和耗时，以及各缓存的命中统计
+    """
+    return {
+        "crypto_executor": CRYPTO_EXECUTOR.metrics(),
+        "batch_verification": (
+            dict(SIGNATURE_VERIFIER.stats) if SIGNATURE_VERIFIER is not None else None
+        ),
+        "did_document_cache": dict(DID_DOCUMENT_CACHE.stats),
+        "verification_key_cache": (
+            VERIFICATION_KEY_CACHE.metrics() if VERIFICATION_KEY_CACHE is not None else None
+        ),
+        "bearer_token_cache": (
+            dict(BEARER_TOKEN_CACHE.stats) if BEARER_TOKEN_CACHE is not None else None
+        ),
+    }
+
+
+def set_nonce_store(store: NonceStore) -> None:
+    """
+    替换 nonce 存储
+
+    Args:
+        store: 新的 nonce 存储
+    """
+    global NONCE_STORE
+    NONCE_STORE = store
 
-async def check_and_cleanup_if_needed():
-    """检查是否需要清理过期的 nonce，如果需要则清理"""
-    current_time = datetime.now(timezone.utc)
-    global LAST_CLEANUP_TIME
 
-    # 如果距离上次清理时间超过了清理间隔，则执行清理
-    if (current_time - LAST_CLEANUP_TIME).total_seconds() > CLEANUP_INTERVAL_SECONDS:
-        await cleanup_expired_nonces()
+async def close_nonce_store() -> None:
+    """关闭当前的 nonce 存储：停止内存存储的后台清理任务，或关闭 Redis 连接"""
+    await NONCE_STORE.close()
 
 
 async def verify_and_record_nonce(did: str, nonce: str) -> bool:
     """
-    验证 nonce 是否有效并记录到本地字典
+    验证 nonce 是否有效并记录到 nonce 存储
 
     Args:
         did: DID 标识符
@@ -180,59 +261,18 @@ async def verify_and_record_nonce(did: str, nonce: str) -> bool:
         HTTPException: 当 nonce 无效或操作失败时
     """
     try:
-        # 检查 nonce 是否已被使用
-        if did in USED_NONCES and nonce in USED_NONCES[did]:
+        # 检查 nonce 是否已被使用，未使用则原子地记录
+        if not await NONCE_STORE.check_and_record(did, nonce):
             logging.error(f"Nonce {nonce} has already been used for DID {did}")
             raise HTTPException(status_code=401, detail="Nonce has already been used")
 
-        # 记录新的 nonce
-        current_time = datetime.now(timezone.utc)
-
-        # 如果 DID 不在字典中，创建一个新的条目
-        if did not in USED_NONCES:
-            USED_NONCES[did] = {}
-
-        # 记录 nonce 使用情况
-        USED_NONCES[did][nonce] = current_time
-
-        # 数据库操作（注释掉）
-        """
-        # 检查 nonce 是否已存在
-        check_query = '''
-            SELECT timestamp, created_at 
-            FROM nonces 
-            WHERE did = %s AND nonce = %s
-        '''
-        result = execute_query(check_query, did, nonce)
-        
-        if result:
-            # nonce 已被使用
-            logging.error(f"Nonce {nonce} has already been used for DID {did}")
-            raise HTTPException(
-                status_code=401, 
-                detail="Nonce has already been used"
-            )
-            
-        # 记录新的 nonce
-        current_time = datetime.now(timezone.utc)
-        insert_query = '''
-            INSERT INTO nonces 
-            (did, nonce, timestamp, created_at) 
-            VALUES (%s, %s, %s, %s)
-        '''
-        execute_insert(
-            insert_query, 
-            did, 
-            nonce, 
-            current_time,
-            current_time
-        )
-        """
-
         return True
 
     except HTTPException as http_exc:
         raise http_exc
+    except NonceStoreFullError as e:
+        logging.error(f"Cannot record nonce: {e}")
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
     except Exception as e:
         logging.error(f"Error verifying/recording nonce: {e}")
         logging.error("Stack trace:")
@@ -263,15 +303,25 @@ async def generate_did_auth_token(authorization: str, domain: str) -> str:
                 status_code=401, detail="DID not found in authorization"
             )
 
-        # 解析DID文档
-        did_doc = await resolve_did_wba_document(did)
+        # 解析DID文档（优先使用缓存）
+        did_doc = await DID_DOCUMENT_CACHE.get(did)
+        if not did_doc:
+            logging.error(f"Failed to resolve DID document: {did}")
+            raise HTTPException(status_code=403, detail="Authentication failed")
 
-        logging.info(f"Resolved DID document: {did_doc}")
-        logging.info(f"Domain: {domain}")
-        logging.info(f"Authorization: {authorization}")
+        log.debug("Resolved DID document", did=did, domain=domain, document=did_doc)
 
-        # 验证签名
-        is_valid, message = verify_auth_header_signature(authorization, did_doc, domain)
+        # 验证签名（在执行器中运行，不阻塞事件循环）
+        if SIGNATURE_VERIFIER is not None:
+            is_valid, message = await SIGNATURE_VERIFIER.verify(authorization, did_doc, domain)
+        elif VERIFICATION_KEY_CACHE is not None:
+            is_valid, message = await CRYPTO_EXECUTOR.run(
+                "verify", VERIFICATION_KEY_CACHE.verify, authorization, did_doc, domain
+            )
+        else:
+            is_valid, message = await CRYPTO_EXECUTOR.run(
+                "verify", verify_auth_header_signature, authorization, did_doc, domain
+            )
         if not is_valid:
             logging.error(f"Signature verification failed: {message}")
             raise HTTPException(status_code=403, detail="Authentication failed")
@@ -284,16 +334,23 @@ async def generate_did_auth_token(authorization: str, domain: str) -> str:
             "iat": current_time,
         }
 
-        # 使用jwt_config模块获取私钥
-        private_key = get_jwt_private_key()
+        # 使用jwt_config模块的密钥签名（在执行器中运行）
+        kid, private_key = get_jwt_key_manager().signing_key()
         if not private_key:
             logging.error("JWT private key not found")
             raise HTTPException(status_code=500, detail="Server configuration error")
 
-        token = jwt.encode(payload, private_key, algorithm="RS256")
-        logging.info(f"Generated JWT token for DID: {did}")
+        token = await CRYPTO_EXECUTOR.run("sign", sign_jwt, payload, kid)
+        log.info("Generated JWT token", did=did)
         return token
 
+    except CryptoExecutorBusyError as e:
+        logging.error(f"Rejecting DID authentication: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, try again later",
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
     except Exception as e:
         logging.error(f"Error in DID authentication: {e}")
         raise
@@ -312,17 +369,47 @@ async def verify_bearer_token(token: str) -> bool:
     Raises:
         HTTPException: 当 token 无效或过期时
     """
+    await verify_bearer_token_claims(token)
+    return True
+
+
+async def verify_bearer_token_claims(token: str) -> Dict[str, Any]:
+    """
+    验证 Bearer token 并返回其 claims
+
+    Args:
+        token: JWT token
+
+    Returns:
+        Dict[str, Any]: token 的 claims，sub 为认证时的 DID
+
+    Raises:
+        HTTPException: 当 token 无效或过期时
+    """
+    # 同一个 token 已验证过且未过期时跳过签名验证
+    if BEARER_TOKEN_CACHE is not None:
+        claims = BEARER_TOKEN_CACHE.get(token)
+        if claims is not None:
+            return claims
+
     try:
-        # 使用jwt_config模块获取公钥
-        public_key = get_jwt_public_key()
+        # 按 token 头中的 kid 获取已解析的公钥，没有 kid 时使用当前密钥
+        kid = jwt.get_unverified_header(token).get("kid")
+        key_manager = get_jwt_key_manager()
+        public_key = key_manager.verification_key(kid)
+        if not public_key and kid:
+            logging.error(f"Unknown token key id: {kid}")
+            raise HTTPException(status_code=403, detail="Invalid token")
         if not public_key:
             logging.error("JWT public key not found")
             raise HTTPException(status_code=500, detail="Server configuration error")
 
-        # 验证 JWT token
-        jwt.decode(token, public_key, algorithms=["RS256"])
-        logging.info("Bearer token verification successful")
-        return True
+        # 验证 JWT token，只接受该密钥对应的算法
+        claims = jwt.decode(token, public_key, algorithms=[key_manager.algorithm(kid)])
+        if BEARER_TOKEN_CACHE is not None:
+            BEARER_TOKEN_CACHE.put(token, claims, kid=kid, verification_key=public_key)
+        log.debug("Bearer token signature verified", kid=kid)
+        return claims
     except jwt.ExpiredSignatureError:
         logging.error("Token has expired")
         raise HTTPException(status_code=401, detail="Token has expired")
@@ -337,6 +424,8 @@ async def authenticate_did_request(
     """
     验证 DID 请求
 
+    认证成功后，请求方的 DID 写入 request.state.did，路由中可用于权限判断。
+
     Args:
         request: FastAPI 请求对象
         authorization: 认证头（可选）
@@ -349,39 +438,33 @@ async def authenticate_did_request(
     """
     try:
         # 检查路径是否豁免
-        if request.url.path in EXEMPT_PATHS:
-            logging.info(
-                f"Path {request.url.path} is in EXEMPT_PATHS, skipping authentication"
-            )
+        if request.url.path in EXEMPT_PATH_SET:
+            log.debug("Exempt path, skipping authentication", path=request.url.path)
             return True, None
 
         # 如果未提供 authorization，尝试从请求头获取
         if not authorization:
             authorization = request.headers.get("Authorization")
-            logging.info(
-                f"Got Authorization header from request: {authorization[:30]}..."
-            )
 
         if not authorization:
             logging.error("Authorization header missing")
             raise HTTPException(status_code=401, detail="Authorization header missing")
 
         auth_lower = authorization.lower()
-        logging.info(
-            f"Authorization type: {'DIDwba' if 'didwba ' in auth_lower else 'Bearer' if 'bearer ' in auth_lower else 'Unknown'}"
-        )
 
         # 获取并验证域名
         domain = get_and_validate_domain(request)
-        logging.info(f"Validated domain: {domain}")
 
         # 处理 DID 认证
         if "didwba " in auth_lower:
-            logging.info("Processing DID authentication")
             # 提取 DID、nonce 和 timestamp
             did, nonce, timestamp, _, _ = extract_auth_header_parts(authorization)
-            logging.info(
-                f"Extracted DID: {did}, nonce: {nonce}, timestamp: {timestamp}"
+            log.info(
+                "Processing DID authentication",
+                did=did,
+                nonce=nonce,
+                timestamp=timestamp,
+                domain=domain,
             )
 
             # 验证 timestamp
@@ -390,25 +473,22 @@ async def authenticate_did_request(
                 raise HTTPException(
                     status_code=401, detail="Invalid or expired timestamp"
                 )
-            logging.info("Timestamp verification successful")
 
             # 验证并记录 nonce
             await verify_and_record_nonce(did, nonce)
-            logging.info("Nonce verification and recording successful")
 
             # 生成 token
             token = await generate_did_auth_token(authorization, domain)
-            logging.info(f"Generated token: {token[:30]}...")
+            request.state.did = did
             return True, token
 
         # 处理 Bearer token 认证
         elif "bearer " in auth_lower:
-            logging.info("Processing Bearer token authentication")
-            token = authorization[authorization.lower().find("bearer ") + 7 :]
-            logging.info(f"Extracted token: {token[:30]}...")
-            if await verify_bearer_token(token):
-                logging.info("Bearer token verification successful")
-                return True, None
+            token = authorization[auth_lower.find("bearer ") + 7 :]
+            claims = await verify_bearer_token_claims(token)
+            request.state.did = claims.get("sub")
+            log.debug("Bearer token authentication successful", sample_every=100)
+            return True, None
 
         else:
             logging.error("Unsupported authorization type")
@@ -436,11 +516,8 @@ async def did_auth_middleware(request: Request, call_next):
     Returns:
         Response: 响应对象
     """
-    # 检查是否需要清理过期的 nonce
-    await check_and_cleanup_if_needed()
-
     try:
-        logging.info(f"Processing request to {request.url.path}")
+        log.debug("Processing request", path=request.scope["path"])
         is_authenticated, token = await authenticate_did_request(request)
 
         if not is_authenticated:
@@ -454,10 +531,7 @@ async def did_auth_middleware(request: Request, call_next):
 
         if token:
             # 修改响应头，添加 token
-            logging.info(f"Adding token to response headers: {token[:30]}...")
             response.headers["Authorization"] = f"Bearer {token}"
-        else:
-            logging.info("No token generated, not adding to response headers")
 
         return response
 
@@ -465,4 +539,73 @@ async def did_auth_middleware(request: Request, call_next):
         logging.error(
             f"Authentication exception: status_code={exc.status_code}, detail={exc.detail}"
         )
-        return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+        return JSONResponse(
+            status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers
+        )
+
+
+class DIDAuthMiddleware:
+    """
+    纯 ASGI 实现的 DID 认证中间件
+
+    认证逻辑与 did_auth_middleware 相同，但不经过 BaseHTTPMiddleware：不为每个
+    请求创建额外的任务和响应流，流式响应也不会被缓冲。新生成的 token 通过改写
+    http.response.start 消息的响应头加入 Authorization。
+
+    用法：app.add_middleware(DIDAuthMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp, exempt_paths: Iterable[str] = EXEMPT_PATHS):
+        """
+        初始化中间件
+
+        Args:
+            app: 下一层 ASGI 应用
+            exempt_paths: 不需要认证的路径
+        """
+        self.app = app
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            is_authenticated, token = await authenticate_did_request(request)
+        except HTTPException as exc:
+            logging.error(
+                f"Authentication exception: status_code={exc.status_code}, detail={exc.detail}"
+            )
+            response = JSONResponse(
+                status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers
+            )
+            await response(scope, receive, send)
+            return
+
+        if not is_authenticated:
+            logging.error(f"Authentication failed: path={scope['path']}")
+            response = JSONResponse(status_code=401, content={"detail": "Authentication failed"})
+            await response(scope, receive, send)
+            return
+
+        if not token:
+            await self.app(scope, receive, send)
+            return
+
+        # 在响应头中加入新生成的 token
+        authorization_header = (b"authorization", f"Bearer {token}".encode("latin-1"))
+
+        async def send_with_token(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != b"authorization"
+                ]
+                headers.append(authorization_header)
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_token)
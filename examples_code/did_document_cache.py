@@ -0,0 +1,186 @@
+"""
+DID 文档缓存，避免每次 DID-WBA 握手都远程解析 DID 文档。
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from agent_connect.authentication import resolve_did_wba_document
+
+# 解析函数：输入 DID，返回 DID 文档，失败时返回 None
+DIDResolver = Callable[[str], Awaitable[Optional[Dict]]]
+
+
+class DIDDocumentCache:
+    """
+    有界的异步 DID 文档缓存
+
+    - 解析成功的文档缓存 ttl 秒，解析失败的 DID 缓存 negative_ttl 秒（负缓存）
+    - 同一个 DID 的并发解析只发起一次远程请求（single-flight）
+    - 文档过期后的 stale_ttl 秒内直接返回旧文档，同时在后台刷新（stale-while-revalidate）
+    - 密钥轮换时通过 invalidate 使某个 DID 的缓存立即失效
+    """
+
+    def __init__(
+        self,
+        resolver: DIDResolver = resolve_did_wba_document,
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        stale_ttl: float = 600.0,
+        max_entries: int = 1024,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            resolver: DID 文档解析函数
+            ttl: 解析成功的文档的新鲜期（秒）
+            negative_ttl: 解析失败结果的缓存时间（秒）
+            stale_ttl: 文档过期后仍可返回旧文档并后台刷新的时间（秒）
+            max_entries: 最多缓存的 DID 数量，超出后淘汰最久未使用的
+        """
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # DID 文档失效或内容变化时的回调
+        self._listeners: List[Callable[[str], None]] = []
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "negative_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+        }
+
+    async def get(self, did: str) -> Optional[Dict]:
+        """
+        获取 DID 文档
+
+        Args:
+            did: DID 标识符
+
+        Returns:
+            Optional[Dict]: DID 文档，无法解析时返回 None
+        """
+        now = time.monotonic()
+        entry = self._entries.get(did)
+        if entry is not None:
+            self._entries.move_to_end(did)
+            if now < entry["expires_at"]:
+                if entry["document"] is None:
+                    self.stats["negative_hits"] += 1
+                else:
+                    self.stats["hits"] += 1
+                return entry["document"]
+
+            # 已过期但仍在 stale 窗口内：返回旧文档并在后台刷新
+            if entry["document"] is not None and now < entry["stale_until"]:
+                self.stats["stale_hits"] += 1
+                self._start_resolve(did)
+                return entry["document"]
+
+        if did in self._inflight:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+        task = self._start_resolve(did)
+        # shield 保证某个等待者被取消时不会取消共享的解析任务
+        return await asyncio.shield(task)
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """
+        注册回调，某个 DID 的文档被 invalidate 或刷新为不同内容时以该 DID 调用，
+        用于同步失效依赖 DID 文档的缓存（例如已解析的公钥）
+
+        Args:
+            callback: 回调函数
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, did: str) -> None:
+        for callback in self._listeners:
+            try:
+                callback(did)
+            except Exception as e:
+                logging.error(f"DID document cache listener failed for {did}: {e}")
+
+    def invalidate(self, did: str) -> bool:
+        """
+        使某个 DID 的缓存失效，用于密钥轮换
+
+        Args:
+            did: DID 标识符
+
+        Returns:
+            bool: 是否存在被删除的缓存
+        """
+        self.stats["invalidations"] += 1
+        # 丢弃进行中的解析，它可能拿到的是轮换前的文档
+        self._inflight.pop(did, None)
+        removed = self._entries.pop(did, None) is not None
+        self._notify(did)
+        logging.info(f"Invalidated cached DID document for {did}")
+        return removed
+
+    def _start_resolve(self, did: str) -> asyncio.Task:
+        """启动（或复用）某个 DID 的解析任务"""
+        task = self._inflight.get(did)
+        if task is None:
+            task = asyncio.create_task(self._resolve(did))
+            self._inflight[did] = task
+        return task
+
+    async def _resolve(self, did: str) -> Optional[Dict]:
+        """远程解析 DID 文档并写入缓存"""
+        task = asyncio.current_task()
+        try:
+            try:
+                document = await self.resolver(did)
+            except Exception as e:
+                logging.error(f"Failed to resolve DID document for {did}: {e}")
+                document = None
+
+            # 解析期间被 invalidate 的结果不写入缓存
+            if self._inflight.get(did) is not task:
+                return document
+
+            previous = self._entries.get(did)
+            if document is None and previous is not None and previous["document"] is not None:
+                # 后台刷新失败时保留旧文档，直到 stale 窗口结束
+                if time.monotonic() < previous["stale_until"]:
+                    return previous["document"]
+
+            self._store(did, document)
+            # 包括被 LRU 淘汰后重新解析的情况，依赖方可能还持有旧文档派生的数据
+            if previous is None or previous["document"] != document:
+                self._notify(did)
+            return document
+        finally:
+            if self._inflight.get(did) is task:
+                self._inflight.pop(did, None)
+
+    def _store(self, did: str, document: Optional[Dict]) -> None:
+        now = time.monotonic()
+        if document is None:
+            expires_at = now + self.negative_ttl
+            stale_until = expires_at
+        else:
+            expires_at = now + self.ttl
+            stale_until = expires_at + self.stale_ttl
+        self._entries[did] = {
+            "document": document,
+            "expires_at": expires_at,
+            "stale_until": stale_until,
+        }
+        self._entries.move_to_end(did)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -3,10 +3,16 @@ JWT configuration module providing functions to get JWT public and private keys.
 """
 
 import os
+import time
 import logging
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -20,6 +26,25 @@ BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 DEFAULT_PRIVATE_KEY_PATH = str(BASE_DIR / "private_key.pem")
 DEFAULT_PUBLIC_KEY_PATH = str(BASE_DIR / "public_key.pem")
 
+# Supported JWT signing algorithms
+SUPPORTED_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+# Algorithm of the default key pair, selected with the JWT_ALGORITHM environment variable
+JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM", "RS256")
+
+# Default (private, public) key files of each algorithm
+DEFAULT_KEY_FILES = {
+    "RS256": (DEFAULT_PRIVATE_KEY_PATH, DEFAULT_PUBLIC_KEY_PATH),
+    "ES256": (str(BASE_DIR / "es256_private_key.pem"), str(BASE_DIR / "es256_public_key.pem")),
+    "EdDSA": (str(BASE_DIR / "ed25519_private_key.pem"), str(BASE_DIR / "ed25519_public_key.pem")),
+}
+
+# Key id of the default key pair, written to the "kid" header of issued tokens
+DEFAULT_KEY_ID = "default"
+
+# Minimum number of seconds between two checks of a key file's modification time
+KEY_RELOAD_CHECK_INTERVAL_SECONDS = 5.0
+
 
 def get_jwt_private_key(key_path: str = DEFAULT_PRIVATE_KEY_PATH) -> Optional[str]:
     """
@@ -77,6 +102,290 @@ def get_jwt_public_key(key_path: str = DEFAULT_PUBLIC_KEY_PATH) -> Optional[str]
         return None
 
 
+def _resolve_key_path(key_path: str) -> str:
+    if not os.path.isabs(key_path):
+        key_path = str(BASE_DIR / key_path)
+    return key_path
+
+
+def key_algorithm(key: Any) -> Optional[str]:
+    """
+    Get the JWT algorithm matching a cryptography key object
+
+    Args:
+        key: Private or public key object
+
+    Returns:
+        Optional[str]: "RS256", "ES256" or "EdDSA", or None for an unsupported key type
+    """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+        return "ES256" if isinstance(key.curve, ec.SECP256R1) else None
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+    return None
+
+
+def generate_jwt_private_key(algorithm: str) -> Any:
+    """
+    Generate a new private key for a JWT algorithm
+
+    Args:
+        algorithm: One of SUPPORTED_ALGORITHMS
+
+    Returns:
+        Any: cryptography private key object
+    """
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+
+def generate_jwt_key_pair(
+    algorithm: str, private_key_path: str, public_key_path: str
+) -> None:
+    """
+    Generate a key pair for a JWT algorithm and write it to PEM files
+
+    Args:
+        algorithm: One of SUPPORTED_ALGORITHMS
+        private_key_path: Path of the private key PEM file to write
+        public_key_path: Path of the public key PEM file to write
+    """
+    private_key = generate_jwt_private_key(algorithm)
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    with open(_resolve_key_path(private_key_path), "wb") as f:
+        f.write(private_pem)
+    with open(_resolve_key_path(public_key_path), "wb") as f:
+        f.write(public_pem)
+    logger.info(f"Generated {algorithm} key pair: {private_key_path}, {public_key_path}")
+
+
+class JWTKeyManager:
+    """
+    Parsed JWT signing and verification keys, indexed by key id.
+
+    Keys are read from their PEM files once and kept as cryptography key
+    objects, so signing and verifying a token does no file I/O and no PEM
+    parsing. Every key file is re-checked at most once per check interval
+    and reloaded when its modification time changed. Several key ids can
+    be registered at once to rotate keys: tokens are signed with the active
+    key, and tokens carrying the key id of an older key still verify as
+    long as that key is registered. Each key id is bound to the algorithm
+    of its key, so a token is only ever verified with that algorithm.
+    """
+
+    def __init__(self, check_interval: float = KEY_RELOAD_CHECK_INTERVAL_SECONDS):
+        """
+        Initialize the key manager
+
+        Args:
+            check_interval: Minimum number of seconds between two modification time checks of a key file
+        """
+        self.check_interval = check_interval
+        self.active_kid: Optional[str] = None
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_key(
+        self,
+        kid: str,
+        private_key_path: Optional[str] = None,
+        public_key_path: Optional[str] = None,
+        active: bool = False,
+        algorithm: Optional[str] = None,
+    ) -> None:
+        """
+        Register a key pair
+
+        Args:
+            kid: Key id written to the token header
+            private_key_path: Path of the private key PEM file, None for a verification-only key
+            public_key_path: Path of the public key PEM file
+            active: Sign new tokens with this key
+            algorithm: Expected JWT algorithm, inferred from the key if None. Keys of another type are rejected.
+        """
+        if algorithm is not None and algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        entry = {
+            "algorithm": algorithm,
+            "paths": {
+                "private": _resolve_key_path(private_key_path) if private_key_path else None,
+                "public": _resolve_key_path(public_key_path) if public_key_path else None,
+            },
+            "keys": {"private": None, "public": None},
+            "mtimes": {"private": None, "public": None},
+            "checked_at": 0.0,
+        }
+        with self._lock:
+            self._keys[kid] = entry
+            self._refresh(entry, force=True)
+            if active or self.active_kid is None:
+                self.active_kid = kid
+
+    def remove_key(self, kid: str) -> None:
+        """Stop accepting tokens signed with a key"""
+        with self._lock:
+            self._keys.pop(kid, None)
+            if self.active_kid == kid:
+                self.active_kid = next(iter(self._keys), None)
+
+    @staticmethod
+    def _load(kind: str, path: str) -> Any:
+        with open(path, "rb") as f:
+            data = f.read()
+        if kind == "private":
+            return serialization.load_pem_private_key(data, password=None)
+        return serialization.load_pem_public_key(data)
+
+    def _refresh(self, entry: Dict[str, Any], force: bool = False) -> None:
+        """Reload the key files of an entry whose modification time changed"""
+        now = time.monotonic()
+        if not force and now - entry["checked_at"] < self.check_interval:
+            return
+        entry["checked_at"] = now
+
+        for kind, path in entry["paths"].items():
+            if path is None:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError as e:
+                logger.error(f"Key file not accessible: {path}: {e}")
+                continue
+            if mtime == entry["mtimes"][kind]:
+                continue
+            try:
+                key = self._load(kind, path)
+                algorithm = key_algorithm(key)
+                if algorithm is None or (
+                    entry["algorithm"] is not None and algorithm != entry["algorithm"]
+                ):
+                    raise ValueError(
+                        f"key type {type(key).__name__} does not match algorithm {entry['algorithm']}"
+                    )
+                entry["algorithm"] = algorithm
+                entry["keys"][kind] = key
+                entry["mtimes"][kind] = mtime
+                logger.info(f"Loaded JWT {kind} key from {path}")
+            except Exception as e:
+                # Keep serving the previously loaded key
+                logger.error(f"Error loading JWT {kind} key from {path}: {e}")
+
+    def _get(self, kid: Optional[str], kind: str) -> Optional[Any]:
+        with self._lock:
+            kid = kid or self.active_kid
+            entry = self._keys.get(kid) if kid else None
+            if entry is None:
+                return None
+            self._refresh(entry)
+            return entry["keys"][kind]
+
+    def algorithm(self, kid: Optional[str] = None) -> Optional[str]:
+        """
+        Get the JWT algorithm of a key id
+
+        Args:
+            kid: Key id, None for the active key
+
+        Returns:
+            Optional[str]: Algorithm, or None if the key id is unknown
+        """
+        with self._lock:
+            entry = self._keys.get(kid or self.active_kid)
+            return entry["algorithm"] if entry else None
+
+    def signing_key(self, kid: Optional[str] = None) -> Tuple[Optional[str], Optional[Any]]:
+        """
+        Get the key new tokens are signed with
+
+        Args:
+            kid: Key id, None for the active key
+
+        Returns:
+            Tuple[Optional[str], Optional[Any]]: (key id, private key object), the key is None if it is not available
+        """
+        kid = kid or self.active_kid
+        return kid, self._get(kid, "private")
+
+    def verification_key(self, kid: Optional[str] = None) -> Optional[Any]:
+        """
+        Get the public key verifying tokens signed with a key id
+
+        Args:
+            kid: Key id from the token header, None for the active key
+
+        Returns:
+            Optional[Any]: Public key object, or None if the key id is unknown
+        """
+        return self._get(kid, "public")
+
+
+_key_manager: Optional[JWTKeyManager] = None
+
+
+def get_jwt_key_manager() -> JWTKeyManager:
+    """
+    Get the shared key manager, loading the default key pair on first use
+
+    Returns:
+        JWTKeyManager: Key manager holding the default key pair of JWT_ALGORITHM as the active key
+    """
+    global _key_manager
+    if _key_manager is None:
+        if JWT_ALGORITHM not in SUPPORTED_ALGORITHMS:
+            raise ValueError(
+                f"Unsupported JWT_ALGORITHM {JWT_ALGORITHM}, expected one of {SUPPORTED_ALGORITHMS}"
+            )
+        private_key_path, public_key_path = DEFAULT_KEY_FILES[JWT_ALGORITHM]
+        manager = JWTKeyManager()
+        manager.add_key(
+            DEFAULT_KEY_ID,
+            private_key_path,
+            public_key_path,
+            active=True,
+            algorithm=JWT_ALGORITHM,
+        )
+        _key_manager = manager
+    return _key_manager
+
+
+def sign_jwt(payload: Dict[str, Any], kid: Optional[str] = None) -> str:
+    """
+    Sign a JWT with a key of the shared key manager
+
+    Takes only picklable arguments, so it can run in a process pool; every
+    worker process then loads the keys into its own key manager once.
+
+    Args:
+        payload: Token claims
+        kid: Key id to sign with, None for the active key
+
+    Returns:
+        str: Encoded token with the key id in its header
+    """
+    key_manager = get_jwt_key_manager()
+    kid, private_key = key_manager.signing_key(kid)
+    if private_key is None:
+        raise ValueError(f"JWT private key not available for key id {kid}")
+    return jwt.encode(
+        payload, private_key, algorithm=key_manager.algorithm(kid), headers={"kid": kid}
+    )
+
+
 # Example usage
 if __name__ == "__main__":
     # Print the absolute paths being used
@@ -0,0 +1,207 @@
+"""
+DID-WBA 握手的 nonce 存储，用于防重放。
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class NonceStoreFullError(Exception):
+    """nonce 存储已达到容量上限"""
+
+
+class NonceStore(ABC):
+    """
+    nonce 存储接口
+
+    实现需要保证 check_and_record 的原子性：同一个 (did, nonce) 在有效期内
+    只有第一次调用返回 True。
+    """
+
+    @abstractmethod
+    async def check_and_record(self, did: str, nonce: str) -> bool:
+        """
+        检查 nonce 是否未被使用，并记录
+
+        Args:
+            did: DID 标识符
+            nonce: nonce 值
+
+        Returns:
+            bool: nonce 未被使用过时返回 True，已被使用时返回 False
+
+        Raises:
+            NonceStoreFullError: 存储已满，无法记录新的 nonce
+        """
+
+    async def close(self) -> None:
+        """释放存储占用的资源"""
+
+
+class InMemoryNonceStore(NonceStore):
+    """
+    按时间分桶的内存 nonce 存储
+
+    每个 nonce 记录在其写入时间所在的桶中，过期时整桶删除，插入和过期都是
+    均摊 O(1)，不再需要遍历所有 DID 和 nonce。过期清理在后台任务中执行，
+    不占用请求路径。记录数达到 max_entries 时拒绝新的 nonce（而不是淘汰
+    仍在有效期内的 nonce，那样会重新打开重放窗口）。
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 360.0,
+        bucket_seconds: float = 10.0,
+        max_entries: int = 100000,
+        cleanup_interval_seconds: float = 10.0,
+    ):
+        """
+        初始化存储
+
+        Args:
+            ttl_seconds: nonce 的保留时间（秒），应大于时间戳的有效期
+            bucket_seconds: 每个时间桶覆盖的时间（秒）
+            max_entries: 最多记录的 nonce 数量
+            cleanup_interval_seconds: 后台清理的间隔（秒）
+        """
+        self.ttl_seconds = ttl_seconds
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self.cleanup_interval_seconds = cleanup_interval_seconds
+
+        # (did, nonce) -> 所在的桶编号
+        self._seen: Dict[Tuple[str, str], int] = {}
+        # 桶编号 -> 该桶内的 (did, nonce)，按时间顺序排列
+        self._buckets: "OrderedDict[int, List[Tuple[str, str]]]" = OrderedDict()
+        self._cleanup_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def _bucket_id(self, now: float) -> int:
+        return int(now // self.bucket_seconds)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        删除整桶过期的 nonce
+
+        Returns:
+            int: 删除的 nonce 数量
+        """
+        now = time.monotonic() if now is None else now
+        # 桶内最新的 nonce 也过期后才删除整个桶
+        oldest_live = self._bucket_id(now - self.ttl_seconds)
+        removed = 0
+        while self._buckets:
+            bucket_id = next(iter(self._buckets))
+            if bucket_id >= oldest_live:
+                break
+            for key in self._buckets.pop(bucket_id):
+                if self._seen.get(key) == bucket_id:
+                    del self._seen[key]
+                    removed += 1
+        return removed
+
+    def _ensure_cleanup_task(self) -> None:
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.cleanup_interval_seconds)
+            try:
+                removed = self.expire()
+                if removed > 0:
+                    logging.info(f"Cleaned up {removed} expired nonces")
+            except Exception as e:
+                logging.error(f"Error during nonce cleanup: {e}")
+
+    async def check_and_record(self, did: str, nonce: str) -> bool:
+        self._ensure_cleanup_task()
+
+        key = (did, nonce)
+        if key in self._seen:
+            return False
+
+        now = time.monotonic()
+        if len(self._seen) >= self.max_entries:
+            # 先尝试清理，仍然已满则拒绝
+            self.expire(now)
+            if len(self._seen) >= self.max_entries:
+                raise NonceStoreFullError(
+                    f"Nonce store is full ({self.max_entries} entries)"
+                )
+
+        bucket_id = self._bucket_id(now)
+        bucket = self._buckets.get(bucket_id)
+        if bucket is None:
+            bucket = []
+            self._buckets[bucket_id] = bucket
+        bucket.append(key)
+        self._seen[key] = bucket_id
+        return True
+
+    async def close(self) -> None:
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+
+
+class RedisNonceStore(NonceStore):
+    """
+    基于 Redis 的 nonce 存储，多个 worker 可以共享防重放状态
+
+    每个 nonce 用 SET key NX EX ttl 原子写入，由 Redis 负责过期。client 可以是
+    redis.asyncio.Redis，也可以是任何实现了同样 set(name, value, nx=, ex=)
+    协程接口的对象（例如测试用的本地 fake）。
+    """
+
+    def __init__(self, client: Any, ttl_seconds: float = 360.0, key_prefix: str = "anp:nonce:"):
+        """
+        初始化存储
+
+        Args:
+            client: 异步 Redis 客户端
+            ttl_seconds: nonce 的保留时间（秒）
+            key_prefix: Redis 键前缀
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisNonceStore":
+        """
+        根据 Redis URL 创建存储，需要安装 redis 包
+
+        Args:
+            url: Redis URL，例如 redis://localhost:6379/0
+            **kwargs: 传给构造函数的其他参数
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError(
+                "RedisNonceStore.from_url requires the redis package: pip install redis"
+            ) from e
+        return cls(redis.from_url(url), **kwargs)
+
+    async def check_and_record(self, did: str, nonce: str) -> bool:
+        key = f"{self.key_prefix}{did}:{nonce}"
+        created = await self.client.set(key, "1", nx=True, ex=max(1, int(self.ttl_seconds)))
+        return bool(created)
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None) or getattr(self.client, "close", None)
+        if close is not None:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
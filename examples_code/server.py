@@ -3,13 +3,22 @@ A FastAPI server that uses did_auth_middleware as middleware.
 """
 
 import logging
+import os
+from contextlib import asynccontextmanager
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import the middleware
-from examples_code.did_auth_middleware import did_auth_middleware
+from examples_code.did_auth_middleware import (
+    DIDAuthMiddleware,
+    close_nonce_store,
+    get_auth_metrics,
+    invalidate_did_document,
+    set_nonce_store,
+)
+from examples_code.nonce_store import RedisNonceStore
 
 # Configure logging
 logging.basicConfig(
@@ -17,11 +26,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# DIDs allowed to call the /admin endpoints, comma separated; empty disables them
+ADMIN_DIDS = frozenset(
+    did.strip() for did in os.environ.get("ANP_ADMIN_DIDS", "").split(",") if did.strip()
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the nonce store on shutdown (its cleanup task or Redis connection)"""
+    yield
+    await close_nonce_store()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="ANP Example Server",
     description="An example server using DID authentication middleware",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -34,8 +57,12 @@ app.add_middleware(
     expose_headers=["Authorization"],  # Important: expose Authorization header
 )
 
-# Add the middleware
-app.middleware("http")(did_auth_middleware)
+# Add the middleware (pure ASGI, so responses are not buffered)
+app.add_middleware(DIDAuthMiddleware)
+
+# Share replay protection state between workers through Redis if configured
+if os.environ.get("ANP_NONCE_REDIS_URL"):
+    set_nonce_store(RedisNonceStore.from_url(os.environ["ANP_NONCE_REDIS_URL"]))
 
 
 @app.get("/")
@@ -53,20 +80,46 @@ async def test(request: Request):
     Test endpoint that returns 200 OK.
     """
     logger.info("Received test request")
-    logger.info(f"Request headers: {request.headers}")
 
-    # Log if the request has an Authorization header
+    # Log only the scheme of the Authorization header, never the credentials
     auth_header = request.headers.get("Authorization")
     if auth_header:
-        logger.info(f"Authorization header present: {auth_header[:30]}...")
+        logger.debug(f"Authorization header present, scheme: {auth_header.split(' ', 1)[0]}")
     else:
-        logger.info("No Authorization header present")
+        logger.debug("No Authorization header present")
 
     response = {"status": "OK", "message": "Test endpoint successful"}
     logger.info(f"Returning response: {response}")
     return response
 
 
+async def require_admin(request: Request):
+    """
+    Allow only requests authenticated as one of ADMIN_DIDS.
+    """
+    did = getattr(request.state, "did", None)
+    if did is None or did not in ADMIN_DIDS:
+        logger.warning(f"Rejected admin request: path={request.url.path}, did={did}")
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+
+@app.get("/admin/auth-metrics", dependencies=[Depends(require_admin)])
+async def auth_metrics():
+    """
+    Authentication metrics: signature executor queue depth and latency, cache hit counts.
+    """
+    return get_auth_metrics()
+
+
+@app.delete("/admin/did-documents/{did}", dependencies=[Depends(require_admin)])
+async def invalidate_did(did: str):
+    """
+    Drop the cached DID document of a DID, e.g. after its keys were rotated.
+    """
+    removed = invalidate_did_document(did)
+    return {"did": did, "invalidated": removed}
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """
@@ -0,0 +1,114 @@
+"""
+已验证 Bearer token 的缓存，避免同一个 token 反复做签名验证。
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class VerifiedTokenCache:
+    """
+    有界 LRU 缓存，保存验证通过的 token 的 claims
+
+    键是 token 的 SHA-256，不在内存中保存 token 原文。条目在 token 的 exp
+    到期时失效，命中时直接返回 claims，跳过签名验证。只有完全相同的 token
+    字符串才会命中，因此被篡改的 token 一定会走完整验证。
+
+    每个条目记录验证它的 kid 和公钥。设置了 key_lookup 时，每次命中都会按
+    kid 重新获取当前公钥，密钥被删除或轮换（公钥对象变化）后，用旧密钥验证
+    过的 token 不再命中，会重新走完整验证。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        key_lookup: Optional[Callable[[Optional[str]], Any]] = None,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的 token 数量，超出后淘汰最久未使用的
+            key_lookup: kid -> 当前的公钥对象，未知的 kid 返回 None
+        """
+        self.max_entries = max_entries
+        self.key_lookup = key_lookup
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "revoked": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        获取已验证 token 的 claims
+
+        Args:
+            token: JWT token
+
+        Returns:
+            Optional[Dict[str, Any]]: 未过期的已验证 token 的 claims，否则返回 None
+        """
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if entry["exp"] <= time.time():
+            del self._entries[key]
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        if (
+            self.key_lookup is not None
+            and entry["key"] is not None
+            and self.key_lookup(entry["kid"]) is not entry["key"]
+        ):
+            # 验证该 token 的密钥已被删除或替换
+            del self._entries[key]
+            self.stats["revoked"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry["claims"]
+
+    def put(
+        self,
+        token: str,
+        claims: Dict[str, Any],
+        kid: Optional[str] = None,
+        verification_key: Any = None,
+    ) -> None:
+        """
+        缓存验证通过的 token，没有 exp 的 token 不缓存
+
+        Args:
+            token: JWT token
+            claims: 解码后的 claims
+            kid: token 头中的 kid
+            verification_key: 验证 token 所用的公钥对象，命中时与 key_lookup(kid) 比较
+        """
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = {
+            "claims": claims,
+            "exp": float(exp),
+            "kid": kid,
+            "key": verification_key,
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存，例如在撤销签名密钥之后"""
+        self._entries.clear()
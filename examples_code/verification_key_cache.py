@@ -0,0 +1,186 @@
+"""
+按 (DID, 验证方法 id) 缓存已解析的公钥，重复握手时跳过 DID 文档遍历和公钥解码。
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jcs
+from agent_connect.authentication import extract_auth_header_parts
+from agent_connect.authentication.verification_methods import create_verification_method
+
+
+def find_verification_method(did_document: Dict, verification_method_id: str) -> Optional[Dict]:
+    """
+    在 DID 文档的 verificationMethod 和 authentication 中查找验证方法
+
+    Args:
+        did_document: DID 文档
+        verification_method_id: 完整的验证方法 id
+
+    Returns:
+        Optional[Dict]: 验证方法，未找到时返回 None
+    """
+    methods = did_document.get("verificationMethod") or []
+    for method in methods:
+        if isinstance(method, dict) and method.get("id") == verification_method_id:
+            return method
+
+    for auth in did_document.get("authentication") or []:
+        # 引用形式只能指向 verificationMethod 中的方法，上面已经查找过
+        if isinstance(auth, dict) and auth.get("id") == verification_method_id:
+            return auth
+    return None
+
+
+def verify_auth_header(
+    authorization: str,
+    did_document: Dict,
+    domain: str,
+    verifiers: Dict[str, Any],
+    on_parse: Optional[Callable[[], None]] = None,
+) -> Tuple[bool, str]:
+    """
+    验证 DID 认证头签名，与 verify_auth_header_signature 的逻辑相同，
+    但复用 verifiers 中已解析的公钥
+
+    Args:
+        authorization: DID 认证头
+        did_document: DID 文档
+        domain: 服务器域名
+        verifiers: 验证方法 id -> (验证方法, 已解析的验证对象)，新解析的公钥会写入其中
+        on_parse: 解析了新公钥时调用，用于统计
+
+    Returns:
+        Tuple[bool, str]: (是否验证成功, 说明)
+    """
+    try:
+        client_did, nonce, timestamp, verification_method, signature = (
+            extract_auth_header_parts(authorization)
+        )
+        if (did_document.get("id") or "").lower() != client_did.lower():
+            return False, "DID mismatch"
+
+        content_hash = hashlib.sha256(
+            jcs.canonicalize(
+                {"nonce": nonce, "timestamp": timestamp, "service": domain, "did": client_did}
+            )
+        ).digest()
+
+        verification_method_id = f"{client_did}#{verification_method}"
+        method_dict = find_verification_method(did_document, verification_method_id)
+        if not method_dict:
+            return False, "Verification method not found"
+
+        # 只有验证方法与解析时完全相同才复用公钥，文档中的公钥变化后会重新解析
+        cached = verifiers.get(verification_method_id)
+        if cached is not None and cached[0] == method_dict:
+            verifier = cached[1]
+        else:
+            try:
+                verifier = create_verification_method(method_dict)
+            except ValueError as e:
+                return False, f"Invalid or unsupported verification method: {str(e)}"
+            verifiers[verification_method_id] = (copy.deepcopy(method_dict), verifier)
+            if on_parse is not None:
+                on_parse()
+
+        if verifier.verify_signature(content_hash, signature):
+            return True, "Verification successful"
+        return False, "Signature verification failed"
+    except ValueError as e:
+        return False, str(e)
+    except Exception as e:
+        return False, f"Verification process error: {str(e)}"
+
+
+class VerificationKeyCache:
+    """
+    已解析验证方法的缓存，键为 (DID, 验证方法 id)
+
+    按 DID 分组保存，LRU 淘汰最久未使用的 DID。每次验证都会在当前 DID 文档中
+    查找验证方法，并与解析公钥时的验证方法比较，不同则重新解析，因此缓存的
+    公钥不会比文档更旧。DID 文档被 invalidate 或刷新时调用 invalidate 释放该
+    DID 的公钥（见 DIDDocumentCache.add_listener）。验签在线程池中执行，所有操作都加锁。
+    缓存只存在于当前进程，进程池模式下不使用。
+    """
+
+    def __init__(self, max_dids: int = 1024):
+        """
+        初始化缓存
+
+        Args:
+            max_dids: 最多缓存公钥的 DID 数量
+        """
+        self.max_dids = max_dids
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"verifications": 0, "keys_parsed": 0, "invalidations": 0}
+
+    def _verifiers(self, did: str) -> Dict[str, Any]:
+        with self._lock:
+            verifiers = self._entries.get(did)
+            if verifiers is None:
+                verifiers = {}
+                self._entries[did] = verifiers
+                while len(self._entries) > self.max_dids:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(did)
+            return verifiers
+
+    def verify(self, authorization: str, did_document: Dict, domain: str) -> Tuple[bool, str]:
+        """
+        使用缓存的公钥验证 DID 认证头
+
+        Args:
+            authorization: DID 认证头
+            did_document: DID 文档
+            domain: 服务器域名
+
+        Returns:
+            Tuple[bool, str]: (是否验证成功, 说明)
+        """
+        verifiers = self._verifiers(did_document.get("id") or "")
+        result = verify_auth_header(
+            authorization, did_document, domain, verifiers, on_parse=self._count_parse
+        )
+        with self._lock:
+            self.stats["verifications"] += 1
+        return result
+
+    def _count_parse(self) -> None:
+        with self._lock:
+            self.stats["keys_parsed"] += 1
+
+    def verify_batch(self, items: List[Tuple[str, Dict, str]]) -> List[Tuple[bool, str]]:
+        """批量验证，与 batch_verifier.verify_batch 相同但使用缓存的公钥"""
+        return [self.verify(*item) for item in items]
+
+    def invalidate(self, did: str) -> None:
+        """
+        删除某个 DID 的全部公钥
+
+        Args:
+            did: DID 标识符
+        """
+        with self._lock:
+            if self._entries.pop(did, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, int]: DID 数、公钥数、验签次数、解析公钥次数和失效次数
+        """
+        with self._lock:
+            return {
+                "dids": len(self._entries),
+                "keys": sum(len(verifiers) for verifiers in self._entries.values()),
+                **self.stats,
+            }
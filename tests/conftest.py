@@ -0,0 +1,6 @@
+import os
+
+# anp_examples.simple_example validates the model configuration on import
+os.environ.setdefault("DASHSCOPE_API_KEY", "test")
+os.environ.setdefault("DASHSCOPE_BASE_URL", "http://localhost")
+os.environ.setdefault("DASHSCOPE_MODEL_NAME", "test")
@@ -0,0 +1,47 @@
+import yaml
+
+from web_app.backend.document_store import DETAIL_URLS, DocumentStore, slim_documents
+
+# OpenAPI responses with unquoted status codes parse to integer keys next to "default"
+OPENAPI_YAML = """
+openapi: 3.0.0
+paths:
+  /hotels:
+    get:
+      responses:
+        200:
+          description: Hotel list
+        404:
+          description: Not found
+        default:
+          description: Error
+"""
+
+
+def test_put_mixed_key_types():
+    content = {"data": yaml.safe_load(OPENAPI_YAML), "format": "yaml"}
+    store = DocumentStore()
+
+    entry = store.put(content)
+
+    assert store.get(entry["content_id"]) is content
+    assert store.put(content) == entry
+    assert store.stats()["documents"] == 1
+
+
+def test_slim_documents_yaml_urls():
+    content = {
+        "data": yaml.safe_load(OPENAPI_YAML),
+        "format": "yaml",
+        "content_type": "application/yaml",
+        "status_code": 200,
+    }
+    documents = [{"url": "https://example.com/api.yaml", "method": "GET", "content": content}]
+    store = DocumentStore()
+
+    slim = slim_documents(documents, store, DETAIL_URLS)
+
+    assert slim[0]["url"] == "https://example.com/api.yaml"
+    assert slim[0]["format"] == "yaml"
+    assert slim[0]["status_code"] == 200
+    assert store.get(slim[0]["content_id"]) is content
@@ -0,0 +1,37 @@
+import logging
+
+from anp_examples.utils.log_base import get_logger
+
+
+def test_level_helpers_sample_events(caplog):
+    log = get_logger("tests.sampling")
+    with caplog.at_level(logging.DEBUG, logger="tests.sampling"):
+        for _ in range(250):
+            log.debug("Bearer token authentication successful", sample_every=100)
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 3
+    assert all("sampled=1/100" in message for message in messages)
+    assert not any("sample_every" in message for message in messages)
+
+
+def test_level_helpers_pass_max_chars(caplog):
+    log = get_logger("tests.max_chars")
+    with caplog.at_level(logging.INFO, logger="tests.max_chars"):
+        log.info("Fetched", body="x" * 50, max_chars=10)
+
+    message = caplog.records[0].getMessage()
+    assert "x" * 11 not in message
+    assert "max_chars" not in message
+
+
+def test_records_point_at_the_caller(caplog):
+    log = get_logger("tests.caller")
+    with caplog.at_level(logging.DEBUG, logger="tests.caller"):
+        log.info("helper")
+        log.log(logging.INFO, "direct")
+
+    assert [record.funcName for record in caplog.records] == [
+        "test_records_point_at_the_caller",
+        "test_records_point_at_the_caller",
+    ]
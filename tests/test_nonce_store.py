@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from examples_code.nonce_store import InMemoryNonceStore, NonceStore, RedisNonceStore
+
+
+class FakeRedis:
+    """In-memory stand-in for redis.asyncio.Redis, supporting SET with NX and EX"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.values = {}
+        self.expires_at = {}
+        self.set_calls = []
+
+    async def set(self, name, value, nx=False, ex=None):
+        self.set_calls.append({"name": name, "value": value, "nx": nx, "ex": ex})
+        if name in self.expires_at and self.expires_at[name] <= self.now:
+            del self.values[name]
+            del self.expires_at[name]
+        if nx and name in self.values:
+            return None
+        self.values[name] = value
+        if ex is not None:
+            self.expires_at[name] = self.now + ex
+        return True
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_nonce_store_is_abstract():
+    with pytest.raises(TypeError):
+        NonceStore()
+
+
+def test_redis_nonce_store_rejects_duplicate_nonce():
+    client = FakeRedis()
+    store = RedisNonceStore(client, ttl_seconds=360)
+
+    async def run():
+        return [
+            await store.check_and_record("did:wba:example.com:alice", "nonce-1"),
+            await store.check_and_record("did:wba:example.com:alice", "nonce-1"),
+            await store.check_and_record("did:wba:example.com:alice", "nonce-2"),
+            await store.check_and_record("did:wba:example.com:bob", "nonce-1"),
+        ]
+
+    assert asyncio.run(run()) == [True, False, True, True]
+    assert client.set_calls[0] == {
+        "name": "anp:nonce:did:wba:example.com:alice:nonce-1",
+        "value": "1",
+        "nx": True,
+        "ex": 360,
+    }
+
+
+def test_redis_nonce_store_accepts_nonce_after_ttl():
+    client = FakeRedis()
+    store = RedisNonceStore(client, ttl_seconds=360)
+
+    async def run():
+        first = await store.check_and_record("did:wba:example.com:alice", "nonce-1")
+        client.now += 361
+        second = await store.check_and_record("did:wba:example.com:alice", "nonce-1")
+        await store.close()
+        return first, second
+
+    assert asyncio.run(run()) == (True, True)
+    assert client.closed
+
+
+def test_in_memory_nonce_store_rejects_duplicate_nonce():
+    async def run():
+        store = InMemoryNonceStore()
+        try:
+            return [
+                await store.check_and_record("did:wba:example.com:alice", "nonce-1"),
+                await store.check_and_record("did:wba:example.com:alice", "nonce-1"),
+            ]
+        finally:
+            await store.close()
+
+    assert asyncio.run(run()) == [True, False]
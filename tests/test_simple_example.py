@@ -0,0 +1,77 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from anp_examples.simple_example import handle_tool_calls
+
+
+class FakeANPTool:
+    """Returns a document for every URL except those in failing_urls"""
+
+    def __init__(self, failing_urls=()):
+        self.failing_urls = set(failing_urls)
+        self.fetched = []
+
+    async def execute(self, url, **kwargs):
+        self.fetched.append(url)
+        await asyncio.sleep(0)
+        if url in self.failing_urls:
+            raise RuntimeError(f"fetch failed: {url}")
+        return {"url": url, "status_code": 200}
+
+
+def tool_call(call_id, arguments, name="anp_tool"):
+    if not isinstance(arguments, str):
+        arguments = json.dumps(arguments)
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def run_calls(tool_calls, anp_tool, crawled_documents, max_documents):
+    messages = []
+    asyncio.run(
+        handle_tool_calls(
+            tool_calls, messages, anp_tool, crawled_documents, set(), max_documents
+        )
+    )
+    return messages
+
+
+def test_failed_calls_do_not_use_the_document_budget():
+    crawled_documents = [{"url": "https://example.com/ad.json", "content": {}}]
+    anp_tool = FakeANPTool(failing_urls={"https://example.com/u3"})
+    tool_calls = [
+        tool_call("c1", "{not json"),
+        tool_call("c2", {"url": "https://example.com/u2"}, name="unknown_tool"),
+        tool_call("c3", {"url": "https://example.com/u3"}),
+        tool_call("c4", "[1, 2]"),
+        tool_call("c5", {"url": "https://example.com/u4"}),
+        tool_call("c6", {"url": "https://example.com/u5"}),
+    ]
+
+    messages = run_calls(tool_calls, anp_tool, crawled_documents, max_documents=5)
+
+    assert [message["tool_call_id"] for message in messages] == [
+        "c1", "c2", "c3", "c4", "c5", "c6"
+    ]
+    assert [doc["url"] for doc in crawled_documents] == [
+        "https://example.com/ad.json",
+        "https://example.com/u4",
+        "https://example.com/u5",
+    ]
+    assert not any("maximum number" in message["content"] for message in messages)
+
+
+def test_budget_is_never_exceeded_and_freed_slots_are_reused():
+    crawled_documents = []
+    anp_tool = FakeANPTool(failing_urls={"https://example.com/u1"})
+    tool_calls = [tool_call(f"c{i}", {"url": f"https://example.com/u{i}"}) for i in range(1, 5)]
+
+    messages = run_calls(tool_calls, anp_tool, crawled_documents, max_documents=2)
+
+    # u1 fails and gives its slot to u3; u4 finds the budget spent
+    assert [doc["url"] for doc in crawled_documents] == [
+        "https://example.com/u2",
+        "https://example.com/u3",
+    ]
+    assert "https://example.com/u4" not in anp_tool.fetched
+    assert "maximum number" in messages[3]["content"]
@@ -1,29 +1,55 @@
 import os
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import sys
 import asyncio
-from urllib.parse import urlparse
+from contextlib import asynccontextmanager
+from typing import Literal
 
 # Add project root directory to system path
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
 from anp_examples.utils.log_base import setup_logging
 from anp_examples.anp_tool import ANPTool
+from anp_examples.tool_registry import ANPToolRegistry
+from anp_examples.response_cache import ResponseCache
+from anp_examples.doc_crawler import DocTreeCrawler
+from anp_examples.doc_graph import build_doc_graph
+from anp_examples.link_extractor import extract_links
 from web_app.backend.models import (
     QueryRequest,
     QueryResponse,
     AgentDocTreeRequest,
     AgentDocTreeResponse,
+    CrawlJobResponse,
     GetDocumentRequest,
     GetDocumentResponse,
 )
-from web_app.backend.hotel_order_api import router as hotel_order_router
-from anp_examples.simple_example import simple_crawl
+from web_app.backend.hotel_order_api import (
+    router as hotel_order_router,
+    close_upstream_session,
+)
+from web_app.backend.dependencies import (
+    get_anp_tool,
+    get_crawl_jobs,
+    get_document_store,
+    get_tool_registry,
+)
+from web_app.backend.crawl_jobs import CrawlJobManager, CrawlJobQueueFullError
+from web_app.backend.json_response import fast_json_response
+from web_app.backend.document_store import (
+    DETAIL_FULL,
+    DETAIL_SUMMARY,
+    DocumentStore,
+    slim_documents,
+)
+from anp_examples.simple_example import simple_crawl, simple_crawl_events
+from web_app.backend.sse import SSE_HEADERS, sse_stream
+from web_app.backend.page_assets import PageAssets, watch_enabled
 
 # Set up logging
 setup_logging(logging.INFO)
@@ -32,11 +58,41 @@ setup_logging(logging.INFO)
 BASE_DIR = Path(__file__).resolve().parent.parent
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Get DID paths
+did_document_path = str(ROOT_DIR / "use_did_test_public/did.json")
+private_key_path = str(ROOT_DIR / "use_did_test_public/key-1_private.pem")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared ANPTool registry, close it and the hotel order upstream session on shutdown"""
+    # Agent descriptions rarely change, cache them (optionally on disk) and revalidate with ETag/Last-Modified
+    response_cache = ResponseCache(disk_path=os.environ.get("ANP_RESPONSE_CACHE_PATH"))
+    app.state.tool_registry = ANPToolRegistry(
+        did_document_path=did_document_path,
+        private_key_path=private_key_path,
+        response_cache=response_cache,
+    )
+    app.state.document_store = DocumentStore()
+    # Queued queries run on a bounded worker pool so bursts wait instead of running all at once
+    app.state.crawl_jobs = CrawlJobManager(
+        run_query_job,
+        max_workers=int(os.environ.get("ANP_CRAWL_JOB_WORKERS", "4")),
+        max_queue=int(os.environ.get("ANP_CRAWL_JOB_MAX_QUEUE", "32")),
+    )
+    app.state.crawl_jobs.start()
+    yield
+    await app.state.crawl_jobs.aclose()
+    await app.state.tool_registry.aclose()
+    await close_upstream_session()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="ANP Network Explorer",
     description="Agent Network Explorer application based on ANP protocol",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # 注册酒店订单API路由器
@@ -54,69 +110,36 @@ app.add_middleware(
 # Mount static files directory
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
-# Get DID paths
-did_document_path = str(ROOT_DIR / "use_did_test_public/did.json")
-private_key_path = str(ROOT_DIR / "use_did_test_public/key-1_private.pem")
+# Frontend pages are loaded and compressed once at startup
+page_assets = PageAssets(
+    BASE_DIR / "frontend",
+    ["index.html", "agent-doc-tree.html", "jsonld-viewer.html", "jsonld-network.html"],
+    watch=watch_enabled(),
+)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve frontend page"""
-    try:
-        with open(BASE_DIR / "frontend" / "index.html", "r", encoding="utf-8") as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading frontend page: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error reading frontend page: {str(e)}")
+    return page_assets.response("index.html", request)
 
 
 @app.get("/agent-doc-tree.html", response_class=HTMLResponse)
-async def read_agent_doc_tree():
+async def read_agent_doc_tree(request: Request):
     """Serve agent document tree structure page"""
-    try:
-        with open(
-            BASE_DIR / "frontend" / "agent-doc-tree.html", "r", encoding="utf-8"
-        ) as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading agent document tree structure page: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error reading agent document tree structure page: {str(e)}"
-        )
+    return page_assets.response("agent-doc-tree.html", request)
 
 
 @app.get("/jsonld-viewer", response_class=HTMLResponse)
-async def read_jsonld_viewer():
+async def read_jsonld_viewer(request: Request):
     """Serve JSON-LD viewer page"""
-    try:
-        with open(
-            BASE_DIR / "frontend" / "jsonld-viewer.html", "r", encoding="utf-8"
-        ) as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading JSON-LD viewer page: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error reading JSON-LD viewer page: {str(e)}"
-        )
+    return page_assets.response("jsonld-viewer.html", request)
 
 
 @app.get("/jsonld-network", response_class=HTMLResponse)
-async def read_jsonld_network():
+async def read_jsonld_network(request: Request):
     """Serve JSON-LD network page"""
-    try:
-        with open(
-            BASE_DIR / "frontend" / "jsonld-network.html", "r", encoding="utf-8"
-        ) as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading JSON-LD network page: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error reading JSON-LD network page: {str(e)}"
-        )
+    return page_assets.response("jsonld-network.html", request)
 
 
 @app.get("/api/health")
@@ -125,35 +148,156 @@ async def health_check():
     return {"status": "ok", "service": "ANP Network Explorer API"}
 
 
+@app.get("/api/metrics")
+async def metrics(registry: ANPToolRegistry = Depends(get_tool_registry)):
+    """Metrics of the shared ANPTool instances"""
+    return registry.stats()
+
+
+# Level of document detail in crawl responses: "summary" omits the crawled
+# documents, "urls" lists them with content ids and metadata, "full" embeds
+# their content. Defaults to "full", the response existing clients expect;
+# clients opt into the slimmer levels
+DetailLevel = Literal["summary", "urls", "full"]
+DETAIL_QUERY = Query(DETAIL_FULL, description="summary, urls or full")
+
+# Longest a job poll may wait, well below nginx's proxy_read_timeout
+MAX_JOB_WAIT_SECONDS = 60
+
+
+async def run_query(query_text, agent_url, detail, anp_tool, document_store):
+    """Crawl for a query and build the content of a QueryResponse"""
+    # Use agent URL provided by user or default URL
+    initial_url = agent_url if agent_url else "https://agent-search.ai/ad.json"
+
+    # Call simple_crawl function
+    result = await simple_crawl(
+        user_input=query_text,
+        task_type="general",
+        did_document_path=did_document_path,
+        private_key_path=private_key_path,
+        max_documents=20,  # Crawl up to 10 documents
+        initial_url=initial_url,  # Pass in user provided URL
+        anp_tool=anp_tool,
+    )
+
+    # The response is built here in the shape of QueryResponse and not re-validated
+    return {
+        "content": result["content"],
+        "type": result["type"],
+        "visited_urls": result["visited_urls"],
+        "crawled_documents": slim_documents(result["crawled_documents"], document_store, detail),
+        "task_type": result.get("task_type"),
+    }
+
+
+async def run_query_job(params):
+    """Run a queued query job with the application's shared ANPTool and document store"""
+    return await run_query(
+        params["query"],
+        params["agent_url"],
+        params["detail"],
+        app.state.tool_registry.get(),
+        app.state.document_store,
+    )
+
+
 @app.post("/api/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+async def query(
+    request: QueryRequest,
+    detail: DetailLevel = DETAIL_QUERY,
+    anp_tool: ANPTool = Depends(get_anp_tool),
+    document_store: DocumentStore = Depends(get_document_store),
+):
     """Process query request"""
     try:
-        # Use agent URL provided by user or default URL
-        initial_url = (
-            request.agent_url
-            if request.agent_url
-            else "https://agent-search.ai/ad.json"
-        )
-
-        # Call simple_crawl function
-        result = await simple_crawl(
-            user_input=request.query,
-            task_type="general",
-            did_document_path=did_document_path,
-            private_key_path=private_key_path,
-            max_documents=20,  # Crawl up to 10 documents
-            initial_url=initial_url,  # Pass in user provided URL
+        return fast_json_response(
+            await run_query(request.query, request.agent_url, detail, anp_tool, document_store)
         )
-
-        return result
     except Exception as e:
         logging.error(f"Error processing query: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
+@app.post("/api/query/jobs", response_model=CrawlJobResponse, status_code=202)
+async def submit_query_job(
+    request: QueryRequest,
+    detail: DetailLevel = DETAIL_QUERY,
+    crawl_jobs: CrawlJobManager = Depends(get_crawl_jobs),
+):
+    """Queue a query request, poll GET /api/query/jobs/{job_id} for the result"""
+    try:
+        return crawl_jobs.submit(
+            {"query": request.query, "agent_url": request.agent_url, "detail": detail}
+        )
+    except CrawlJobQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many queued queries, please retry later",
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
+
+
+@app.get("/api/query/jobs")
+async def query_job_stats(crawl_jobs: CrawlJobManager = Depends(get_crawl_jobs)):
+    """Queue depth and job counts of the query job queue"""
+    return crawl_jobs.stats()
+
+
+@app.get("/api/query/jobs/{job_id}", response_model=CrawlJobResponse)
+async def get_query_job(
+    job_id: str,
+    wait: float = Query(
+        0, ge=0, le=MAX_JOB_WAIT_SECONDS, description="Seconds to wait for the job to finish"
+    ),
+    crawl_jobs: CrawlJobManager = Depends(get_crawl_jobs),
+):
+    """Get a query job, optionally waiting (long polling) until it finishes"""
+    job = await crawl_jobs.wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return fast_json_response(job)
+
+
+@app.delete("/api/query/jobs/{job_id}", response_model=CrawlJobResponse)
+async def cancel_query_job(job_id: str, crawl_jobs: CrawlJobManager = Depends(get_crawl_jobs)):
+    """Cancel a queued or running query job"""
+    job = crawl_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return fast_json_response(job)
+
+
+@app.post("/api/query/stream")
+async def query_stream(request: QueryRequest, anp_tool: ANPTool = Depends(get_anp_tool)):
+    """Process query request, streaming crawl progress and answer tokens as Server-Sent Events"""
+    # Use agent URL provided by user or default URL
+    initial_url = (
+        request.agent_url
+        if request.agent_url
+        else "https://agent-search.ai/ad.json"
+    )
+
+    events = simple_crawl_events(
+        user_input=request.query,
+        task_type="general",
+        max_documents=20,
+        initial_url=initial_url,
+        anp_tool=anp_tool,
+        stream=True,
+    )
+    return StreamingResponse(
+        sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+
 @app.post("/api/agent-doc-tree", response_model=AgentDocTreeResponse)
-async def agent_doc_tree(request: AgentDocTreeRequest):
+async def agent_doc_tree(
+    request: AgentDocTreeRequest,
+    detail: DetailLevel = DETAIL_QUERY,
+    anp_tool: ANPTool = Depends(get_anp_tool),
+    document_store: DocumentStore = Depends(get_document_store),
+):
     """Parse agent URL and its child documents, build document tree"""
     try:
         # Use agent URL provided by user or default URL
@@ -163,185 +307,115 @@ async def agent_doc_tree(request: AgentDocTreeRequest):
             else "https://agent-search.ai/ad.json"
         )
 
-        # Initialize ANPTool
-        anp_tool = ANPTool(
-            did_document_path=did_document_path, private_key_path=private_key_path
-        )
-
         # Initialize sets of visited URLs and list of crawled documents
         visited_urls = set()
         crawled_documents = []
 
-        # Recursively get documents
-        await crawl_doc_tree(
+        # Get documents level by level
+        edges = await crawl_doc_tree(
             initial_url, anp_tool, visited_urls, crawled_documents, level=0, max_level=5
         )
 
-        # Process document tree structure
-        doc_tree = process_doc_tree(crawled_documents)
+        # Below full detail, nodes and the document list carry content ids instead of contents
+        documents = slim_documents(crawled_documents, document_store, detail)
+
+        # Build the document tree and cross-links from the recorded crawl edges
+        doc_graph = build_doc_graph(
+            crawled_documents if detail == DETAIL_SUMMARY else documents,
+            edges,
+            embed_documents=detail != DETAIL_SUMMARY,
+        )
 
-        return {
-            "doc_tree": doc_tree,
-            "visited_urls": list(visited_urls),
-            "crawled_documents": crawled_documents,
-        }
+        return fast_json_response(
+            {
+                "doc_tree": doc_graph["doc_tree"],
+                "links": doc_graph["links"],
+                "visited_urls": list(visited_urls),
+                "crawled_documents": documents,
+            }
+        )
     except Exception as e:
         logging.error(f"Error building document tree: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error building document tree: {str(e)}")
 
 
 async def crawl_doc_tree(
-    url, anp_tool, visited_urls, crawled_documents, level=0, max_level=5, max_docs=30
+    url,
+    anp_tool,
+    visited_urls,
+    crawled_documents,
+    level=0,
+    max_level=5,
+    max_docs=30,
+    max_workers=8,
+    per_host_limit=4,
 ):
-    """Function to recursively get documents and their linked content"""
-    # Return if already visited URL or reached max depth or document count limit
-    if url in visited_urls or level >= max_level or len(crawled_documents) >= max_docs:
-        return
-
-    try:
-        # Use ANPTool to get URL content
-        result = await anp_tool.execute(url=url)
-
-        # Record visited URL and obtained content
-        visited_urls.add(url)
-        crawled_documents.append({"url": url, "method": "GET", "content": result})
-
-        logging.info(f"Successfully obtained document: {url}, current depth: {level}")
-
-        # Extract links from document
-        links = extract_links(result)
-
-        # Recursively get linked documents
-        for link in links:
-            if len(crawled_documents) >= max_docs:
-                break
-
-            # Skip already visited URLs
-            if link in visited_urls:
-                continue
-
-            await crawl_doc_tree(
-                link,
-                anp_tool,
-                visited_urls,
-                crawled_documents,
-                level + 1,
-                max_level,
-                max_docs,
-            )
-
-    except Exception as e:
-        logging.error(f"Failed to get document: {url}, error: {str(e)}")
-
-
-def extract_links(data):
-    """Extract links from JSON-LD document"""
-    links = set()
-
-    def traverse(obj):
-        if not obj or not isinstance(obj, dict):
-            return
-
-        # Process links in specific fields
-        for key in ["@id", "url", "serviceEndpoint"]:
-            if key in obj and isinstance(obj[key], str) and is_valid_url(obj[key]):
-                links.add(obj[key])
-
-        # Check if other properties are objects or arrays
-        for key, value in obj.items():
-            if key == "@context":
-                continue  # Skip @context
-
-            if isinstance(value, dict):
-                traverse(value)
-            elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        traverse(item)
-
-    traverse(data)
-    return links
+    """Get documents and their linked content breadth-first with concurrent fetches
+
+    Returns:
+        List of (parent URL, child URL) edges discovered while crawling
+    """
+    crawler = DocTreeCrawler(
+        anp_tool,
+        extract_links,
+        max_level=max_level - level,
+        max_docs=max_docs - len(crawled_documents),
+        max_workers=max_workers,
+        per_host_limit=per_host_limit,
+    )
+    # Skip URLs that were already visited by the caller
+    crawler.visited_urls.update(visited_urls)
 
+    await crawler.crawl(url)
 
-def is_valid_url(url):
-    """Validate if URL is valid"""
-    try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except:
-        return False
-
-
-def process_doc_tree(documents):
-    """Process documents, build tree structure"""
-    doc_tree = {"name": "Root Node", "children": []}
-    url_map = {}
-
-    # First add all document nodes
-    for doc in documents:
-        url = doc["url"]
-        node = {"name": url.split("/")[-1], "url": url, "children": [], "doc": doc}
-        url_map[url] = node
-
-        # If it's the root node
-        if doc == documents[0]:
-            doc_tree["children"].append(node)
-
-    # Then establish connection relationships
-    for doc in documents[1:]:  # Skip the first (root) document
-        url = doc["url"]
-        node = url_map[url]
-
-        # Find parent node
-        found_parent = False
-        for parent_doc in documents:
-            parent_url = parent_doc["url"]
-            if parent_url == url:
-                continue
-
-            # Check if parent document content contains current URL
-            try:
-                content_str = str(parent_doc["content"])
-                if url in content_str:
-                    # Found a possible parent node
-                    parent_node = url_map[parent_url]
-                    parent_node["children"].append(node)
-                    found_parent = True
-                    break
-            except:
-                pass
-
-        # If no parent node found, add to root node
-        if not found_parent:
-            doc_tree["children"].append(node)
-
-    return doc_tree
+    visited_urls.update(crawler.visited_urls)
+    crawled_documents.extend(crawler.crawled_documents)
+    return crawler.edges
 
 
 @app.post("/api/get-document", response_model=GetDocumentResponse)
-async def get_document(request: GetDocumentRequest):
-    """Get document content by URL"""
+async def get_document(
+    request: GetDocumentRequest,
+    anp_tool: ANPTool = Depends(get_anp_tool),
+    document_store: DocumentStore = Depends(get_document_store),
+):
+    """Get document content by content id of a crawled document, or by URL"""
+    # Contents of crawled documents are served from the store without refetching
+    if request.content_id:
+        content = document_store.get(request.content_id)
+        if content is not None:
+            return fast_json_response(
+                {
+                    "url": request.url,
+                    "content_id": request.content_id,
+                    "content": content,
+                    "success": True,
+                    "message": "Successfully retrieved document",
+                }
+            )
+        # Evicted or unknown: fall back to fetching the URL if there is one
+        if not request.url:
+            raise HTTPException(status_code=404, detail="Unknown document content id")
+
     try:
         # Get URL
         url = request.url
         if not url:
             raise HTTPException(status_code=400, detail="URL parameter cannot be empty")
 
-        # Initialize ANPTool
-        anp_tool = ANPTool(
-            did_document_path=did_document_path, private_key_path=private_key_path
-        )
-
         # Use ANPTool to get URL content
         try:
             result = await anp_tool.execute(url=url)
 
-            return {
-                "url": url,
-                "content": result,
-                "success": True,
-                "message": "Successfully retrieved document",
-            }
+            return fast_json_response(
+                {
+                    "url": url,
+                    "content_id": None,
+                    "content": result,
+                    "success": True,
+                    "message": "Successfully retrieved document",
+                }
+            )
         except Exception as e:
             logging.error(f"Failed to get document via ANPTool: {url}, error: {str(e)}")
             return {
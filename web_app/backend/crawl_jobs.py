@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED})
+
+# Runs one job: job parameters -> result
+JobRunner = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class CrawlJobQueueFullError(Exception):
+    """The crawl job queue is full"""
+
+    def __init__(self, retry_after_seconds: int):
+        super().__init__("Crawl job queue is full")
+        self.retry_after_seconds = retry_after_seconds
+
+
+class CrawlJobManager:
+    """
+    In-process queue of crawl jobs run by a bounded pool of worker tasks.
+
+    Submitting a job returns immediately with a job id; max_workers jobs run
+    at a time and at most max_queue more wait in the queue. Beyond that,
+    submit raises CrawlJobQueueFullError and the caller should answer 503
+    with Retry-After, so a burst of queries is queued or turned away instead
+    of starting an unbounded number of concurrent LLM loops. Jobs, including
+    their results, are kept in memory until result_ttl seconds after they
+    finish (and at most max_jobs of them). Callers poll a job, or wait for
+    it to finish, and can cancel queued and running jobs.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        result_ttl: float = 3600.0,
+        max_jobs: int = 1000,
+        retry_after_seconds: int = 30,
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            runner: Coroutine function running one job
+            max_workers: Number of jobs run concurrently
+            max_queue: Maximum number of jobs waiting to run
+            result_ttl: Seconds a finished job and its result are kept
+            max_jobs: Maximum number of jobs kept, the oldest finished jobs are dropped first
+            retry_after_seconds: Suggested wait for clients turned away by a full queue
+        """
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.retry_after_seconds = retry_after_seconds
+
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Job id -> parameters, finished event and task; not part of the job state
+        self._params: Dict[str, Dict[str, Any]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._queued: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self.stats_counters: Dict[str, int] = {
+            "submitted": 0,
+            "rejected": 0,
+            JOB_SUCCEEDED: 0,
+            JOB_FAILED: 0,
+            JOB_CANCELLED: 0,
+        }
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"crawl-job-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+
+    async def aclose(self) -> None:
+        """Stop the workers and cancel all unfinished jobs"""
+        for job_id in list(self._queued):
+            self._finish(job_id, JOB_CANCELLED, error="Server shutting down")
+        for task in list(self._tasks.values()):
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a job
+
+        Args:
+            params: Job parameters passed to the runner
+
+        Returns:
+            Dict[str, Any]: The job state
+
+        Raises:
+            CrawlJobQueueFullError: max_queue jobs are already waiting
+        """
+        if len(self._queued) >= self.max_queue:
+            self.stats_counters["rejected"] += 1
+            logging.warning(f"Crawl job queue full, rejecting job (queued={len(self._queued)})")
+            raise CrawlJobQueueFullError(self.retry_after_seconds)
+
+        self._evict()
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = {
+            "job_id": job_id,
+            "status": JOB_QUEUED,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        self._params[job_id] = params
+        self._events[job_id] = asyncio.Event()
+        self._queued[job_id] = None
+        self._queue.put_nowait(job_id)
+        self.stats_counters["submitted"] += 1
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a job
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Optional[Dict[str, Any]]: The job state with its queue position, None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        position = None
+        if job["status"] == JOB_QUEUED:
+            position = list(self._queued).index(job_id) + 1
+        return dict(job, queue_position=position)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to timeout seconds for a job to finish (long polling)
+
+        Args:
+            job_id: Job id
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            Optional[Dict[str, Any]]: The job state, None if unknown
+        """
+        event = self._events.get(job_id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a queued or running job, finished jobs are left unchanged
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Optional[Dict[str, Any]]: The job state, None if unknown
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        if job["status"] == JOB_QUEUED:
+            self._finish(job_id, JOB_CANCELLED, error="Cancelled")
+        elif job["status"] == JOB_RUNNING:
+            # The worker records the cancellation when the task ends
+            self._tasks[job_id].cancel()
+        return self.get(job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics
+
+        Returns:
+            Dict[str, Any]: Queue depth, running jobs, limits and job counts by outcome
+        """
+        return {
+            "queued": len(self._queued),
+            "running": len(self._tasks),
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "stored_jobs": len(self._jobs),
+            **self.stats_counters,
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            # Cancelled while queued
+            if job_id not in self._queued:
+                continue
+            del self._queued[job_id]
+            job = self._jobs[job_id]
+            job["status"] = JOB_RUNNING
+            job["started_at"] = time.time()
+
+            task = asyncio.create_task(self.runner(self._params[job_id]))
+            self._tasks[job_id] = task
+            try:
+                # wait() does not raise when the job task fails or is cancelled
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._tasks.pop(job_id, None)
+
+            if task.cancelled():
+                self._finish(job_id, JOB_CANCELLED, error="Cancelled")
+            elif task.exception() is not None:
+                logging.error(f"Crawl job {job_id} failed: {task.exception()}")
+                self._finish(job_id, JOB_FAILED, error=str(task.exception()))
+            else:
+                self._finish(job_id, JOB_SUCCEEDED, result=task.result())
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of a job and wake up its waiters"""
+        job = self._jobs[job_id]
+        job.update(status=status, finished_at=time.time(), result=result, error=error)
+        self._queued.pop(job_id, None)
+        self._params.pop(job_id, None)
+        self.stats_counters[status] += 1
+        self._events.pop(job_id).set()
+
+    def _evict(self) -> None:
+        """Drop finished jobs past their TTL, and the oldest finished jobs above max_jobs"""
+        expired_before = time.time() - self.result_ttl
+        excess = len(self._jobs) - self.max_jobs + 1
+        for job_id, job in list(self._jobs.items()):
+            if job["status"] not in FINISHED_STATES:
+                continue
+            if job["finished_at"] < expired_before or excess > 0:
+                del self._jobs[job_id]
+                excess -= 1
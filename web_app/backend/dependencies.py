@@ -0,0 +1,26 @@
+from fastapi import Depends, Request
+
+from anp_examples.anp_tool import ANPTool
+from anp_examples.tool_registry import ANPToolRegistry
+from web_app.backend.crawl_jobs import CrawlJobManager
+from web_app.backend.document_store import DocumentStore
+
+
+def get_tool_registry(request: Request) -> ANPToolRegistry:
+    """Get the ANPTool registry created in the application lifespan hook"""
+    return request.app.state.tool_registry
+
+
+def get_anp_tool(registry: ANPToolRegistry = Depends(get_tool_registry)) -> ANPTool:
+    """Get the shared ANPTool of the application's default DID identity"""
+    return registry.get()
+
+
+def get_document_store(request: Request) -> DocumentStore:
+    """Get the store of crawled document contents created in the application lifespan hook"""
+    return request.app.state.document_store
+
+
+def get_crawl_jobs(request: Request) -> CrawlJobManager:
+    """Get the query job queue created in the application lifespan hook"""
+    return request.app.state.crawl_jobs
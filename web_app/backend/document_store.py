@@ -0,0 +1,131 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Response detail levels of the crawl endpoints
+DETAIL_SUMMARY = "summary"
+DETAIL_URLS = "urls"
+DETAIL_FULL = "full"
+
+# Wrapper fields ANPTool adds to every result, reported as document metadata
+METADATA_FIELDS = ("format", "content_type", "status_code")
+
+
+class DocumentStore:
+    """
+    Content-addressed, in-memory store of crawled document contents.
+
+    Slim crawl responses list documents by content id (a SHA-256 of the
+    canonical JSON of the content) instead of embedding them, and the page
+    fetches a document's content by id only when it is opened. Identical
+    contents share one entry. The least recently used contents are evicted
+    once their serialized size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the store
+
+        Args:
+            max_bytes: Total serialized size of the contents kept in memory
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._size = 0
+
+    def put(self, content: Any) -> Dict[str, Any]:
+        """
+        Store a document content
+
+        Args:
+            content: Document content; values JSON cannot encode are hashed as strings
+
+        Returns:
+            Dict[str, Any]: {"content_id": ..., "size": serialized size in bytes}
+        """
+        body = json.dumps(
+            _canonical(content),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+        content_id = hashlib.sha256(body).hexdigest()
+        size = len(body)
+
+        if content_id in self._entries:
+            self._entries.move_to_end(content_id)
+        else:
+            self._entries[content_id] = {"content": content, "size": size}
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted["size"]
+        return {"content_id": content_id, "size": size}
+
+    def get(self, content_id: str) -> Optional[Any]:
+        """
+        Get a document content by content id
+
+        Args:
+            content_id: Content id returned by put
+
+        Returns:
+            Optional[Any]: The content, or None if it is unknown or was evicted
+        """
+        entry = self._entries.get(content_id)
+        if entry is None:
+            return None
+        self._entries.move_to_end(content_id)
+        return entry["content"]
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Convert dict keys to strings, recursively
+
+    YAML documents can mix integer and string keys (e.g. OpenAPI response
+    codes next to "default"), which json.dumps cannot sort.
+    """
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def slim_documents(
+    documents: List[Dict[str, Any]], store: DocumentStore, detail: str
+) -> List[Dict[str, Any]]:
+    """
+    Reduce crawled documents to the requested detail level
+
+    Args:
+        documents: Crawled documents with "url", "method" and "content"
+        store: Store the contents are put into for later lookup by content id
+        detail: "summary" (no documents), "urls" (URL, method, content id and
+            metadata) or "full" (unchanged)
+
+    Returns:
+        List[Dict[str, Any]]: Documents for the response
+    """
+    if detail == DETAIL_FULL:
+        return documents
+    if detail == DETAIL_SUMMARY:
+        return []
+
+    slim = []
+    for doc in documents:
+        content = doc.get("content")
+        entry = {"url": doc["url"], "method": doc.get("method", "GET")}
+        entry.update(store.put(content))
+        if isinstance(content, dict):
+            for field in METADATA_FIELDS:
+                if field in content:
+                    entry[field] = content[field]
+        slim.append(entry)
+    return slim
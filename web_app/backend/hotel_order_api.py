@@ -1,5 +1,7 @@
+import asyncio
 import logging
-import requests
+import os
+import aiohttp
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
@@ -10,6 +12,70 @@ logging.basicConfig(level=logging.INFO)
 # 创建路由器
 router = APIRouter()
 
+# 酒店订单上游服务地址
+HOTEL_ORDER_API_BASE_URL = os.environ.get("HOTEL_ORDER_API_BASE_URL", "https://agent-connect.ai")
+
+# 上游请求超时时间（秒）
+UPSTREAM_TIMEOUT_SECONDS = 30
+
+# 幂等请求（如查询订单详情）失败后的最大重试次数
+IDEMPOTENT_MAX_RETRIES = 2
+
+# 共享的上游 HTTP 会话，按事件循环创建，复用到 agent-connect.ai 的连接
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def get_upstream_session() -> aiohttp.ClientSession:
+    """获取当前事件循环的共享上游 HTTP 会话"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit_per_host=20, keepalive_timeout=30)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=UPSTREAM_TIMEOUT_SECONDS),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_upstream_session() -> None:
+    """关闭当前事件循环的共享上游 HTTP 会话"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+async def post_upstream(path: str, data: Dict[str, Any], idempotent: bool = False) -> Dict[str, Any]:
+    """
+    异步调用上游酒店订单接口
+
+    Args:
+        path: 接口路径
+        data: 请求数据
+        idempotent: 是否为幂等操作，只有幂等操作会在网络错误或 5xx 时重试
+
+    Returns:
+        Dict[str, Any]: 上游返回的 JSON 数据
+    """
+    url = f"{HOTEL_ORDER_API_BASE_URL}{path}"
+    retries = IDEMPOTENT_MAX_RETRIES if idempotent else 0
+    session = get_upstream_session()
+
+    for attempt in range(retries + 1):
+        try:
+            async with session.post(url, json=data) as response:
+                if response.status >= 500 and attempt < retries:
+                    logging.warning("Upstream %s returned %s, retrying", url, response.status)
+                else:
+                    return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt >= retries:
+                raise
+            logging.warning("Upstream request to %s failed: %s, retrying", url, e)
+        # 指数退避
+        await asyncio.sleep(0.5 * (2 ** attempt))
+
 # 定义创建酒店订单请求模型
 class GuestName(BaseModel):
     name: str
@@ -83,7 +149,7 @@ async def create_and_pay_hotel_order(request: CreateAndPayHotelOrderRequest):
     
     try:
         # 1. 创建酒店订单
-        create_order_url = "https://agent-connect.ai/agents/travel/hotel/api/create_order/ph"
+        create_order_path = "/agents/travel/hotel/api/create_order/ph"
         
         # 准备创建订单的请求数据
         create_order_data = {
@@ -110,9 +176,8 @@ async def create_and_pay_hotel_order(request: CreateAndPayHotelOrderRequest):
             
         logging.info("Calling create hotel order API with data: %s", create_order_data)
         
-        # 发送创建订单请求
-        create_order_response = requests.post(create_order_url, json=create_order_data)
-        create_order_result = create_order_response.json()
+        # 发送创建订单请求（非幂等，不重试）
+        create_order_result = await post_upstream(create_order_path, create_order_data)
         
         logging.info("Create hotel order API response: %s", create_order_result)
         
@@ -137,7 +202,7 @@ async def create_and_pay_hotel_order(request: CreateAndPayHotelOrderRequest):
             }
             
         # 2. 支付酒店订单
-        pay_order_url = "https://agent-connect.ai/agents/travel/hotel/api/pay_order/ph"
+        pay_order_path = "/agents/travel/hotel/api/pay_order/ph"
         
         # 准备支付订单的请求数据
         pay_order_data = {
@@ -147,9 +212,8 @@ async def create_and_pay_hotel_order(request: CreateAndPayHotelOrderRequest):
         
         logging.info("Calling pay hotel order API with data: %s", pay_order_data)
         
-        # 发送支付订单请求
-        pay_order_response = requests.post(pay_order_url, json=pay_order_data)
-        pay_order_result = pay_order_response.json()
+        # 发送支付订单请求（非幂等，不重试）
+        pay_order_result = await post_upstream(pay_order_path, pay_order_data)
         
         logging.info("Pay hotel order API response: %s", pay_order_result)
         
@@ -192,7 +256,7 @@ async def get_hotel_order_detail(request: HotelOrderDetailRequest):
     
     try:
         # 调用酒店订单详情接口
-        order_detail_url = "https://agent-connect.ai/agents/travel/hotel/api/get_order_detail/ph"
+        order_detail_path = "/agents/travel/hotel/api/get_order_detail/ph"
         
         # 准备查询订单详情的请求数据
         order_detail_data = {
@@ -201,9 +265,8 @@ async def get_hotel_order_detail(request: HotelOrderDetailRequest):
         
         logging.info("Calling get hotel order detail API with data: %s", order_detail_data)
         
-        # 发送查询订单详情请求
-        order_detail_response = requests.post(order_detail_url, json=order_detail_data)
-        order_detail_result = order_detail_response.json()
+        # 发送查询订单详情请求（幂等查询，失败时有限重试）
+        order_detail_result = await post_upstream(order_detail_path, order_detail_data, idempotent=True)
         
         logging.info("Get hotel order detail API response: %s", order_detail_result)
         
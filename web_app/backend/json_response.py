@@ -0,0 +1,55 @@
+import json
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    # orjson is a declared dependency; keep serving responses if it is missing
+    orjson = None
+    logging.warning("orjson is not installed, large JSON responses are encoded with the json module")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for large crawl results produced by the server itself.
+
+    Returning it from an endpoint bypasses FastAPI's response_model
+    validation and jsonable_encoder, which walk every value of the nested
+    document contents; the endpoint's response_model still documents the
+    shape in OpenAPI. The body is encoded with orjson when it is installed
+    and with the standard json module otherwise. Values neither can encode
+    natively (e.g. dates parsed from YAML) are written as strings, and
+    non-string keys (e.g. OpenAPI status codes parsed from YAML) are
+    converted to strings.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError as e:
+                # orjson rejects e.g. integers wider than 64 bits, the json module does not
+                logging.warning(f"orjson could not encode response, falling back to json: {e}")
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+
+
+def fast_json_response(content: Any) -> FastJSONResponse:
+    """
+    Wrap a server-built response in FastJSONResponse
+
+    Args:
+        content: Response content in the shape of the endpoint's response_model
+
+    Returns:
+        FastJSONResponse: The response
+    """
+    return FastJSONResponse(content)
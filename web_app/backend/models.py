@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, HttpUrl, Field
+from pydantic import BaseModel, Field
 
 
 class QueryRequest(BaseModel):
@@ -14,7 +14,12 @@ class CrawledDocument(BaseModel):
 
     url: str = Field(..., description="URL that was crawled")
     method: str = Field(..., description="HTTP method")
-    content: Dict[str, Any] = Field(..., description="Response content")
+    content: Optional[Dict[str, Any]] = Field(None, description="Response content, only with detail=full")
+    content_id: Optional[str] = Field(None, description="Content id for /api/get-document")
+    size: Optional[int] = Field(None, description="Size of the content in bytes")
+    format: Optional[str] = Field(None, description="Content format")
+    content_type: Optional[str] = Field(None, description="Response Content-Type")
+    status_code: Optional[int] = Field(None, description="Response status code")
 
 
 class QueryResponse(BaseModel):
@@ -27,6 +32,19 @@ class QueryResponse(BaseModel):
     task_type: Optional[str] = Field(None, description="Task type")
 
 
+class CrawlJobResponse(BaseModel):
+    """Query job state model"""
+
+    job_id: str = Field(..., description="Job id")
+    status: str = Field(..., description="queued, running, succeeded, failed or cancelled")
+    created_at: float = Field(..., description="Submission time (Unix timestamp)")
+    started_at: Optional[float] = Field(None, description="Start time (Unix timestamp)")
+    finished_at: Optional[float] = Field(None, description="Finish time (Unix timestamp)")
+    queue_position: Optional[int] = Field(None, description="Position in the queue while queued, 1 is next")
+    result: Optional[QueryResponse] = Field(None, description="Query result once the job succeeded")
+    error: Optional[str] = Field(None, description="Error message of failed or cancelled jobs")
+
+
 class AgentDocTreeRequest(BaseModel):
     """Agent document tree request model"""
 
@@ -38,25 +56,36 @@ class DocumentNode(BaseModel):
 
     name: str = Field(..., description="Node name")
     url: str = Field(..., description="Node URL")
-    children: List["DocumentNode"] = Field(default=[], description="List of child nodes")
+    children: List["DocumentNode"] = Field(default_factory=list, description="List of child nodes")
     doc: Optional[Dict[str, Any]] = Field(None, description="Document content")
 
 
-# Update recursive reference
-DocumentNode.update_forward_refs()
+# Resolve the recursive reference
+DocumentNode.model_rebuild()
 
 
 class DocumentTree(BaseModel):
     """Document tree model"""
 
     name: str = Field(..., description="Root name")
-    children: List[DocumentNode] = Field(default=[], description="List of child nodes")
+    children: List[DocumentNode] = Field(default_factory=list, description="List of child nodes")
+
+
+class DocumentLink(BaseModel):
+    """Link between two crawled documents"""
+
+    source: str = Field(..., description="URL of the linking document")
+    target: str = Field(..., description="URL of the linked document")
+    type: str = Field(..., description="Link type: tree, cross or back")
 
 
 class AgentDocTreeResponse(BaseModel):
     """Agent document tree response model"""
 
     doc_tree: DocumentTree = Field(..., description="Document tree structure")
+    links: List[DocumentLink] = Field(
+        default_factory=list, description="All links between crawled documents"
+    )
     visited_urls: List[str] = Field(..., description="List of visited URLs")
     crawled_documents: List[CrawledDocument] = Field(..., description="List of crawled documents")
 
@@ -64,13 +93,15 @@ class AgentDocTreeResponse(BaseModel):
 class GetDocumentRequest(BaseModel):
     """Get document request model"""
 
-    url: str = Field(..., description="URL of the document to retrieve")
+    url: Optional[str] = Field(None, description="URL of the document to retrieve")
+    content_id: Optional[str] = Field(None, description="Content id of a crawled document")
 
 
 class GetDocumentResponse(BaseModel):
     """Get document response model"""
 
-    url: str = Field(..., description="URL of the retrieved document")
+    url: Optional[str] = Field(None, description="URL of the retrieved document")
+    content_id: Optional[str] = Field(None, description="Content id of the retrieved document")
     content: Optional[Dict[str, Any]] = Field(None, description="Document content")
     success: bool = Field(..., description="Whether the retrieval was successful")
     message: str = Field(..., description="Message describing the result")
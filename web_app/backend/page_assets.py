@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class PageAssets:
+    """
+    In-memory cache of the frontend HTML pages.
+
+    Pages are read once, precompressed with gzip (and brotli when the brotli
+    package is installed) and served with strong ETags, so requests never
+    touch the disk and unchanged pages are answered with a 304. With watch
+    enabled the file mtime is checked on every request and changed pages are
+    reloaded, which is meant for development.
+    """
+
+    def __init__(self, directory: Path, names: Iterable[str], watch: bool = False):
+        """
+        Initialize and load the pages
+
+        Args:
+            directory: Directory containing the pages
+            names: File names of the pages to serve
+            watch: Reload a page when its file modification time changes
+        """
+        self.directory = Path(directory)
+        self.watch = watch
+        self._pages: Dict[str, Dict] = {}
+        for name in names:
+            self._load(name)
+
+    def _load(self, name: str) -> None:
+        """Read, compress and hash one page"""
+        path = self.directory / name
+        try:
+            mtime = os.stat(path).st_mtime
+            body = path.read_bytes()
+        except OSError as e:
+            logging.error(f"Error reading frontend page {path}: {str(e)}")
+            self._pages.pop(name, None)
+            return
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        variants = {"identity": (body, f'"{digest}"')}
+        variants["gzip"] = (gzip.compress(body, compresslevel=9), f'"{digest}-gzip"')
+        if brotli is not None:
+            variants["br"] = (brotli.compress(body), f'"{digest}-br"')
+
+        self._pages[name] = {"mtime": mtime, "variants": variants}
+        logging.info(f"Loaded frontend page {name} ({len(body)} bytes)")
+
+    def _reload_if_changed(self, name: str) -> None:
+        page = self._pages.get(name)
+        try:
+            mtime = os.stat(self.directory / name).st_mtime
+        except OSError:
+            return
+        if page is None or mtime != page["mtime"]:
+            self._load(name)
+
+    @staticmethod
+    def _choose_encoding(accept_encoding: str, variants: Dict) -> str:
+        accepted = set()
+        for part in accept_encoding.split(","):
+            coding, _, params = part.partition(";")
+            params = params.replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    if float(params[2:]) == 0:
+                        continue
+                except ValueError:
+                    continue
+            accepted.add(coding.strip().lower())
+        for encoding in ("br", "gzip"):
+            if encoding in variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def response(self, name: str, request: Request) -> Response:
+        """
+        Build the response serving a page
+
+        Args:
+            name: File name of the page
+            request: Incoming request, used for Accept-Encoding and If-None-Match
+
+        Returns:
+            Response: The page, or 304 Not Modified when the client copy is current
+        """
+        if self.watch:
+            self._reload_if_changed(name)
+
+        page = self._pages.get(name)
+        if page is None:
+            raise HTTPException(status_code=500, detail=f"Error reading frontend page: {name}")
+
+        encoding = self._choose_encoding(
+            request.headers.get("accept-encoding", ""), page["variants"]
+        )
+        body, etag = page["variants"][encoding]
+
+        headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+def watch_enabled() -> bool:
+    """Whether page reloading is enabled through the PAGE_ASSETS_WATCH environment variable"""
+    return os.environ.get("PAGE_ASSETS_WATCH", "").lower() in ("1", "true", "yes")
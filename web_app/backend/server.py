@@ -2,17 +2,24 @@ import os
 import logging
 import time
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pathlib import Path
 
 # Add project root directory to system path
 import sys
+from contextlib import asynccontextmanager
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
-from anp_examples.simple_example import simple_crawl
+from anp_examples.anp_tool import ANPTool
+from anp_examples.tool_registry import ANPToolRegistry
+from anp_examples.response_cache import ResponseCache
+from anp_examples.simple_example import simple_crawl, simple_crawl_events
 from anp_examples.utils.log_base import setup_logging
 from web_app.backend.models import QueryRequest, QueryResponse
+from web_app.backend.dependencies import get_anp_tool, get_tool_registry
+from web_app.backend.sse import SSE_HEADERS, sse_stream
 
 # Set up logging
 setup_logging()
@@ -21,11 +28,31 @@ logger = logging.getLogger(__name__)
 # Get project root directory
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 
+# Get DID paths
+did_document_path = str(ROOT_DIR / "use_did_test_public/did.json")
+private_key_path = str(ROOT_DIR / "use_did_test_public/key-1_private.pem")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared ANPTool registry and close its sessions on shutdown"""
+    # Agent descriptions rarely change, cache them (optionally on disk) and revalidate with ETag/Last-Modified
+    response_cache = ResponseCache(disk_path=os.environ.get("ANP_RESPONSE_CACHE_PATH"))
+    app.state.tool_registry = ANPToolRegistry(
+        did_document_path=did_document_path,
+        private_key_path=private_key_path,
+        response_cache=response_cache,
+    )
+    yield
+    await app.state.tool_registry.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Agent Network Search API",
     description="Agent Network Search API based on ANP protocol",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -37,10 +64,6 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
-# Get DID paths
-did_document_path = str(ROOT_DIR / "use_did_test_public/did.json")
-private_key_path = str(ROOT_DIR / "use_did_test_public/key-1_private.pem")
-
 
 @app.get("/")
 async def read_root():
@@ -48,8 +71,14 @@ async def read_root():
     return {"message": "Agent Network Search API service is running"}
 
 
+@app.get("/api/metrics")
+async def metrics(registry: ANPToolRegistry = Depends(get_tool_registry)):
+    """Metrics of the shared ANPTool instances"""
+    return registry.stats()
+
+
 @app.post("/api/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+async def query(request: QueryRequest, anp_tool: ANPTool = Depends(get_anp_tool)):
     """Process query request"""
     try:
         start_time = time.time()
@@ -67,6 +96,7 @@ async def query(request: QueryRequest):
             private_key_path=private_key_path,
             max_documents=10,  # Crawl up to 10 documents
             initial_url=initial_url,
+            anp_tool=anp_tool,
         )
         
         elapsed_time = time.time() - start_time
@@ -79,6 +109,25 @@ async def query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
 
+@app.post("/api/query/stream")
+async def query_stream(request: QueryRequest, anp_tool: ANPTool = Depends(get_anp_tool)):
+    """Process query request, streaming crawl progress and answer tokens as Server-Sent Events"""
+    logger.info(f"Streaming query: '{request.query}' with agent URL: {request.agent_url}")
+
+    # Use agent URL provided by user or default URL
+    initial_url = request.agent_url if request.agent_url else "https://agent-search.ai/ad.json"
+
+    events = simple_crawl_events(
+        user_input=request.query,
+        task_type="general",
+        max_documents=10,
+        initial_url=initial_url,
+        anp_tool=anp_tool,
+        stream=True,
+    )
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 if __name__ == "__main__":
     # Start uvicorn server
     logger.info("Starting uvicorn server on 0.0.0.0:9871")
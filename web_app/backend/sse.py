@@ -0,0 +1,22 @@
+import json
+import logging
+from typing import Any, AsyncIterator, Dict
+
+# Headers for event streams, X-Accel-Buffering stops nginx from buffering the events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format a crawl event as a Server-Sent Events message"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Convert crawl events into Server-Sent Events messages, reporting failures as an error event"""
+    try:
+        async for event in events:
+            yield format_sse(event)
+    except Exception as e:
+        logging.error(f"Error streaming query: {str(e)}")
+        yield format_sse({"type": "error", "message": f"Error processing query: {str(e)}"})
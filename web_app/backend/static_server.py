@@ -1,9 +1,14 @@
 import os
+import sys
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
-import logging
+
+# Add project root directory to system path
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from web_app.backend.page_assets import PageAssets, watch_enabled
 
 # Get the project root directory
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -18,19 +23,14 @@ app = FastAPI(
 # Mount the frontend directory
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 
+# The frontend page is loaded and compressed once at startup
+page_assets = PageAssets(BASE_DIR / "frontend", ["index.html"], watch=watch_enabled())
+
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Provide frontend page"""
-    try:
-        with open(BASE_DIR / "frontend" / "index.html") as f:
-            content = f.read()
-        return content
-    except Exception as e:
-        logging.error(f"Error reading frontend page: {str(e)}")
-        raise HTTPException(
-            status_code=500, detail=f"Error reading frontend page: {str(e)}"
-        )
+    return page_assets.response("index.html", request)
 
 
 if __name__ == "__main__":